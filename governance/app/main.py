@@ -9,16 +9,100 @@ Serves:
 
 from __future__ import annotations
 
-from fastapi import FastAPI
+import re
+from functools import lru_cache
+
+import numpy as np
+import orjson
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import ORJSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, Field, TypeAdapter, field_validator
+from starlette.concurrency import run_in_threadpool
 
 from governance.app.registry import (
+    EvalResult,
     get_governance_summary,
-    get_model_by_id,
     get_model_registry,
+    get_registry_etag,
+    get_registry_json,
+    rebuild_registry_artifacts,
 )
 
+# Collection adapter — dumps a model's eval_results in one pydantic-core pass
+# instead of per-instance model_dump() calls.
+_EVALS_ADAPTER = TypeAdapter(list[EvalResult])
+
+# Pre-serialized response bytes for the static governance GET endpoints.
+# The registry is fixed for the process lifetime, so each payload is built and
+# orjson-encoded once; requests then skip model_dump and the response pipeline.
+_RESPONSE_CACHE: dict[str, bytes] = {}
+
+
+@lru_cache(maxsize=1)
+def _registry_columns() -> dict[str, list]:
+    """Column-oriented projection of the registry, built in one pass.
+
+    The aggregation payloads below select from these columns instead of
+    walking the Pydantic instances attribute by attribute per endpoint.
+    """
+    cols: dict[str, list] = {
+        "id": [], "name": [], "risk_rating": [],
+        "open_findings": [], "total_findings": [], "compliance": [],
+    }
+    for m in get_model_registry():
+        cols["id"].append(m.id)
+        cols["name"].append(m.name)
+        cols["risk_rating"].append(m.risk_rating.value)
+        cols["open_findings"].append(m.open_findings)
+        cols["total_findings"].append(m.total_findings)
+        cols["compliance"].append(m.compliance.model_dump())
+    return cols
+
+
+@lru_cache(maxsize=1)
+def _compliance_payload() -> dict:
+    cols = _registry_columns()
+    return {
+        "models": [
+            {"id": i, "name": n, "risk_rating": r, "compliance": c}
+            for i, n, r, c in zip(cols["id"], cols["name"], cols["risk_rating"], cols["compliance"], strict=True)
+        ],
+        "frameworks": ["SR 11-7", "NIST AI 600-1", "OWASP LLM 2025", "OWASP Agentic 2026", "FINRA"],
+    }
+
+
+@lru_cache(maxsize=1)
+def _findings_payload() -> list[dict]:
+    cols = _registry_columns()
+    return [
+        {"model_id": i, "model_name": n, "open_findings": o, "total_findings": t, "risk_rating": r}
+        for i, n, o, t, r in zip(
+            cols["id"], cols["name"], cols["open_findings"], cols["total_findings"], cols["risk_rating"],
+            strict=True,
+        )
+    ]
+
+
+def _build_governance_payloads() -> dict[str, bytes]:
+    payloads = {
+        "summary": orjson.dumps(get_governance_summary()),
+        "models": get_registry_json(),
+        "compliance": orjson.dumps(_compliance_payload()),
+        "findings": orjson.dumps(_findings_payload()),
+    }
+    for m in get_model_registry():
+        payloads[f"model:{m.id}"] = orjson.dumps(m.model_dump(mode="json"))
+    return payloads
+
+
+def _cached_response(key: str) -> Response:
+    if not _RESPONSE_CACHE:
+        _RESPONSE_CACHE.update(_build_governance_payloads())
+    return Response(_RESPONSE_CACHE[key], media_type="application/json")
+
+
 app = FastAPI(
     title="WM GenAI Models Governance",
     description="5 Production GenAI Models + Governance System for WM Risk Model Control",
@@ -30,10 +114,14 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000"],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "OPTIONS"],
+    allow_headers=["content-type", "authorization"],
+    max_age=86400,
 )
 
+# Governance JSON compresses 5-10x; only bodies past 1KB are worth the CPU.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 
 # ── Health ───────────────────────────────────────────────────
 @app.get("/health")
@@ -46,74 +134,82 @@ async def health():
 
 
 # ── Governance API ───────────────────────────────────────────
+@app.on_event("startup")
+async def _warm_response_cache():
+    """Serialize the static governance payloads once per process."""
+    import anyio.to_thread
+
+    # The demo handlers offload their rule-based scans to the threadpool;
+    # widen it so concurrent scans don't queue behind the default 40 tokens.
+    anyio.to_thread.current_default_thread_limiter().total_tokens = 64
+    _RESPONSE_CACHE.update(_build_governance_payloads())
+
+
 @app.get("/api/governance/summary")
 async def governance_summary():
     """Dashboard summary of all governed models."""
-    return get_governance_summary()
+    return _cached_response("summary")
 
 
 @app.get("/api/governance/models")
-async def list_models():
+async def list_models(request: Request):
     """List all governed models."""
-    return [m.model_dump() for m in get_model_registry()]
+    if request.headers.get("if-none-match") == get_registry_etag():
+        return Response(status_code=304)
+    response = _cached_response("models")
+    response.headers["etag"] = get_registry_etag()
+    return response
 
 
 @app.get("/api/governance/models/{model_id}")
 async def get_model(model_id: str):
     """Get details for a specific model."""
-    model = get_model_by_id(model_id)
-    if model is None:
+    if not _RESPONSE_CACHE:
+        _RESPONSE_CACHE.update(_build_governance_payloads())
+    blob = _RESPONSE_CACHE.get(f"model:{model_id}")
+    if blob is None:
         return {"error": "Model not found"}
-    return model.model_dump()
+    return Response(blob, media_type="application/json")
 
 
 @app.get("/api/governance/compliance")
 async def compliance_matrix():
     """Compliance mapping for all models."""
-    models = get_model_registry()
-    return {
-        "models": [
-            {
-                "id": m.id,
-                "name": m.name,
-                "risk_rating": m.risk_rating.value,
-                "compliance": m.compliance.model_dump(),
-            }
-            for m in models
-        ],
-        "frameworks": ["SR 11-7", "NIST AI 600-1", "OWASP LLM 2025", "OWASP Agentic 2026", "FINRA"],
-    }
+    return _cached_response("compliance")
 
 
 @app.get("/api/governance/evaluations")
 async def list_evaluations():
-    """All evaluation results across all models."""
-    models = get_model_registry()
-    results = []
-    for m in models:
-        for e in m.eval_results:
-            results.append({
-                "model_id": m.id,
-                "model_name": m.name,
-                **e.model_dump(),
-            })
-    return results
+    """All evaluation results across all models, streamed one record at a time."""
+    async def _gen():
+        yield b"["
+        first = True
+        for m in get_model_registry():
+            for e in _EVALS_ADAPTER.dump_python(m.eval_results, mode="json"):
+                if not first:
+                    yield b","
+                first = False
+                yield orjson.dumps({"model_id": m.id, "model_name": m.name, **e})
+        yield b"]"
+
+    return StreamingResponse(_gen(), media_type="application/json")
 
 
 @app.get("/api/governance/findings")
 async def list_findings():
     """Findings summary across all models."""
-    models = get_model_registry()
-    return [
-        {
-            "model_id": m.id,
-            "model_name": m.name,
-            "open_findings": m.open_findings,
-            "total_findings": m.total_findings,
-            "risk_rating": m.risk_rating.value,
-        }
-        for m in models
-    ]
+    return _cached_response("findings")
+
+
+@app.post("/api/governance/_reload", include_in_schema=False)
+async def _reload_governance_cache():
+    """Rebuild the cached payloads if the registry is ever edited in place."""
+    rebuild_registry_artifacts()
+    for fn in (_registry_columns, _compliance_payload, _findings_payload):
+        fn.cache_clear()
+    _RESPONSE_CACHE.clear()
+    _RESPONSE_CACHE.update(_build_governance_payloads())
+    return {"status": "reloaded"}
 
 
 # ── Helpers ───────────────────────────────────────────────────
@@ -190,31 +286,122 @@ async def _llm_call(system: str, user: str, response_format=None):
 
 # ── Model Demo API (live, input-aware endpoints) ─────────────
 
+# Missing-input error bodies, orjson-encoded once; handlers wrap them in a
+# fresh Response without re-serializing anything.
+_ERR_NO_DOC_TEXT = orjson.dumps({"error": "Provide 'text' field with financial document text"})
+_ERR_NO_TRANSCRIPT = orjson.dumps({"error": "Provide 'transcript' field"})
+_ERR_NO_PORTFOLIO = orjson.dumps({"error": "Provide 'portfolio' field with JSON data"})
+_ERR_NO_REG_TEXT = orjson.dumps({"error": "Provide 'text' field with regulatory document text"})
+_ERR_NO_COMM_TEXT = orjson.dumps({"error": "Provide 'text' field with draft communication text"})
+
+
+def _error_response(body: bytes) -> Response:
+    return Response(body, media_type="application/json", status_code=400)
+
+
+# Rule-based extraction patterns, compiled once at import — the handlers only
+# call .search()/.finditer() on these.
+
+# document-intelligence
+_FUND_NAME_RE = re.compile(r"(?:The\s+)?([A-Z][A-Za-z\s&]+(?:Fund|Trust|ETF|Portfolio))")
+_TICKER_RE = re.compile(r"\(([A-Z]{3,5}X?)\)")
+_EXPENSE_RATIO_RE = re.compile(r"expense ratio[:\s]+of\s+([\d.]+)%", re.IGNORECASE)
+_AUM_RE = re.compile(r"AUM[:\s]+(?:is\s+)?\$([\d.]+)\s*(billion|million|B|M)", re.IGNORECASE)
+_RETURN_PATTERNS = [
+    ("1_year", re.compile(r"1-year return[:\s]+(?:is\s+)?([\d.]+)%", re.IGNORECASE)),
+    ("ytd", re.compile(r"YTD[:\s]+(?:return\s+)?(?:is\s+)?([\d.]+)%", re.IGNORECASE)),
+    ("3_year", re.compile(r"3-year[:\s]+(?:annualized\s+)?(?:return\s+)?([\d.]+)%", re.IGNORECASE)),
+]
+_HOLDINGS_RE = re.compile(r"([A-Z]{2,5})\s*\(([\d.]+)%\)")
+
+# meeting-summarizer — topics fused into one named-group alternation so the
+# whole transcript is scanned once; group names map back to topic labels.
+_SPEAKER_RE = re.compile(r"^([\w\s]+):")
+_TOPIC_PATTERNS = {
+    "portfolio_review": r"portfolio|allocation|equity|bond|fixed income",
+    "risk_discussion": r"risk|volatility|concern|worried|drawdown",
+    "retirement_planning": r"retire|retirement|401k|ira|pension|social security",
+    "estate_planning": r"estate|trust|529|education|inheritance",
+    "tax_planning": r"tax|roth|conversion|deduction|capital gain",
+    "insurance": r"insurance|annuit|life insurance|long.term care",
+}
+_TOPIC_RE = re.compile(
+    "|".join(f"(?P<{group}>{pat})" for group, pat in _TOPIC_PATTERNS.items()), re.IGNORECASE
+)
+_TOPIC_LABELS = {group: group.replace("_", " ") for group in _TOPIC_PATTERNS}
+_SSN_RE = re.compile(r"\b\d{3}-\d{2}-\d{4}\b")
+# Keyword lists fused into single alternations — one scan per line instead of
+# one substring search per keyword. IGNORECASE replaces the lowercased copies.
+_ACTION_KW_RE = re.compile(
+    "|".join(map(re.escape, ["recommend", "should", "let's", "i'll", "we could", "set up", "open", "send"])),
+    re.IGNORECASE,
+)
+_PROMISSORY_KW_RE = re.compile(
+    "|".join(map(re.escape, ["guaranteed", "risk-free", "can't lose", "promise"])),
+    re.IGNORECASE,
+)
 
-@app.post("/api/models/document-intelligence/extract")
-async def demo_document_extract(body: dict):
-    """Extract structured data from financial document text."""
-    import re
-
-    text = body.get("text", "")
-    if not text:
-        return {"error": "Provide 'text' field with financial document text"}
-
-    # Try LLM extraction
-    if _get_api_key():
-        llm_result = await _llm_call(
-            "You are a financial document analyst for Morgan Stanley WM. Extract ALL data from this document as JSON with fields: fund_name, ticker, cusip, asset_class, risk_level, expense_ratio_pct, management_fee_pct, aum_millions, inception_date, benchmark, returns (ytd_pct, one_year_pct, three_year_pct, five_year_pct), risk_metrics (volatility_pct, sharpe_ratio, max_drawdown_pct, beta), top_holdings (list of {name, ticker, weight_pct}), investment_objective, key_risks (list), regulatory_flags (uses_leverage, uses_derivatives, concentrated), confidence_score (0-1). Only extract what's explicitly stated. Set missing fields to null.",
-            f"Document:\n{text[:8000]}",
-        )
-        if llm_result and "llm_error" not in llm_result:
-            return {
-                "model": "WM Document Intelligence v1.0.0",
-                "mode": "llm_extraction",
-                "powered_by": "GPT-5.2",
-                "extraction": llm_result,
-            }
-
-    # Rule-based extraction from the actual input text
+# regulatory-change-detector
+_REGULATOR_RES = [
+    ("SEC", re.compile(r"\bSEC\b")),
+    ("FINRA", re.compile(r"\bFINRA\b")),
+    ("OCC", re.compile(r"\bOCC\b")),
+    ("CFPB", re.compile(r"\bCFPB\b")),
+    ("Federal Reserve", re.compile(r"\bFed\b|\bFederal Reserve\b")),
+]
+_AREA_RES = {
+    "Advisory Communications": re.compile(r"communication|advertising|marketing|correspondence", re.IGNORECASE),
+    "Compliance": re.compile(r"compliance|supervision|oversight|control", re.IGNORECASE),
+    "Technology": re.compile(r"technology|system|\bAI\b|\bGenAI\b|model|algorithm", re.IGNORECASE),
+    "Risk Management": re.compile(r"risk|model risk|validation|testing", re.IGNORECASE),
+    "Client Services": re.compile(r"client|customer|investor|account", re.IGNORECASE),
+    "Trading": re.compile(r"trading|execution|order|best execution", re.IGNORECASE),
+}
+_URGENT_RE = re.compile(
+    "|".join(map(re.escape, ["effective immediately", "immediately", "emergency", "urgent"])),
+    re.IGNORECASE,
+)
+_MANDATE_RE = re.compile("must|required|shall|mandatory", re.IGNORECASE)
+_GUIDANCE_RE = re.compile(
+    "|".join(map(re.escape, ["recommended", "guidance", "best practice"])), re.IGNORECASE
+)
+_GENAI_RE = re.compile(
+    "|".join(map(re.escape, ["genai", "generative ai", "artificial intelligence", "llm", "large language model"])),
+    re.IGNORECASE,
+)
+_KEY_REQ_RE = re.compile(r"[^.]*(?:must|shall|required)[^.]*(?:\.|$)", re.IGNORECASE)
+
+# compliance-checker — every independent check fused into one named-alternation
+# pattern so the draft is scanned exactly once; the handler dispatches on
+# lastgroup. Promissory matches map to canonical words via _PROMISSORY_CANONICAL.
+_COMPLIANCE_SCAN_RE = re.compile(
+    r"(?P<disclaimer>past performance|no guarantee|may lose value|not indicative)"
+    r"|(?P<promissory>\b(?:guarantee[ds]?|risk[\s-]?free|can'?t lose|will definitely|sure thing|no risk|assured returns?)\b)"
+    r"|(?P<performance>\d+\.?\d*%\s*(?:return|performance|gain|yield|annual))"
+    r"|(?P<ssn>\b\d{3}-\d{2}-\d{4}\b)"
+    r"|(?P<positive>\b(?:great|excellent|outstanding|superior|best|top|outperform)\b)"
+    r"|(?P<riskword>\b(?:risk|loss|decline|volatility|uncertainty|downturn)\b)",
+    re.IGNORECASE,
+)
+_PROMISSORY_CANONICAL = {
+    "guarantee": "guaranteed",
+    "guaranteed": "guaranteed",
+    "guarantees": "guaranteed",
+    "risk free": "risk-free",
+    "risk-free": "risk-free",
+    "riskfree": "risk-free",
+    "cant lose": "can't lose",
+    "can't lose": "can't lose",
+    "will definitely": "will definitely",
+    "sure thing": "sure thing",
+    "no risk": "no risk",
+    "assured return": "assured returns",
+    "assured returns": "assured returns",
+}
+
+
+def _extract_rule_based(text: str) -> dict:
+    """CPU-bound rule-based extraction — runs on the threadpool, off the event loop."""
     fund_name = None
     ticker = None
     expense_ratio = None
@@ -225,39 +412,35 @@ async def demo_document_extract(body: dict):
     asset_class = "equity"
 
     # Extract fund name: look for common patterns
-    name_match = re.search(r"(?:The\s+)?([A-Z][A-Za-z\s&]+(?:Fund|Trust|ETF|Portfolio))", text)
+    name_match = _FUND_NAME_RE.search(text)
     if name_match:
         fund_name = name_match.group(1).strip()
 
     # Extract ticker
-    ticker_match = re.search(r"\(([A-Z]{3,5}X?)\)", text)
+    ticker_match = _TICKER_RE.search(text)
     if ticker_match:
         ticker = ticker_match.group(1)
 
     # Extract expense ratio
-    er_match = re.search(r"expense ratio[:\s]+of\s+([\d.]+)%", text, re.IGNORECASE)
+    er_match = _EXPENSE_RATIO_RE.search(text)
     if er_match:
         expense_ratio = float(er_match.group(1))
 
     # Extract AUM
-    aum_match = re.search(r"AUM[:\s]+(?:is\s+)?\$([\d.]+)\s*(billion|million|B|M)", text, re.IGNORECASE)
+    aum_match = _AUM_RE.search(text)
     if aum_match:
         val = float(aum_match.group(1))
         unit = aum_match.group(2).lower()
         aum = val * 1000 if unit.startswith("b") else val
 
     # Extract returns
-    for period, pattern in [
-        ("1_year", r"1-year return[:\s]+(?:is\s+)?([\d.]+)%"),
-        ("ytd", r"YTD[:\s]+(?:return\s+)?(?:is\s+)?([\d.]+)%"),
-        ("3_year", r"3-year[:\s]+(?:annualized\s+)?(?:return\s+)?([\d.]+)%"),
-    ]:
-        m = re.search(pattern, text, re.IGNORECASE)
+    for period, pattern in _RETURN_PATTERNS:
+        m = pattern.search(text)
         if m:
             returns[period] = float(m.group(1))
 
     # Extract holdings
-    for hm in re.finditer(r"([A-Z]{2,5})\s*\(([\d.]+)%\)", text):
+    for hm in _HOLDINGS_RE.finditer(text):
         holdings.append({"ticker": hm.group(1), "weight_pct": float(hm.group(2))})
 
     # Determine asset class from keywords
@@ -278,7 +461,7 @@ async def demo_document_extract(body: dict):
         risk_level = "high"
 
     # Confidence based on how many fields we extracted
-    fields_found = sum(1 for x in [fund_name, ticker, expense_ratio, aum] if x is not None)
+    fields_found = sum(x is not None for x in (fund_name, ticker, expense_ratio, aum))
     confidence = min(1.0, (fields_found + len(returns) + len(holdings)) / 8)
 
     return {
@@ -300,63 +483,56 @@ async def demo_document_extract(body: dict):
     }
 
 
-@app.post("/api/models/meeting-summarizer/summarize")
-async def demo_meeting_summarize(body: dict):
-    """Summarize meeting transcript — LLM when available, rule-based fallback."""
-    import re
-
-    transcript = body.get("transcript", "")
-    if not transcript:
-        return {"error": "Provide 'transcript' field"}
+@app.post("/api/models/document-intelligence/extract")
+async def demo_document_extract(body: dict):
+    """Extract structured data from financial document text."""
+    text = body.get("text", "")
+    if not text:
+        return _error_response(_ERR_NO_DOC_TEXT)
 
-    # Try LLM summarization
+    # Try LLM extraction
     if _get_api_key():
         llm_result = await _llm_call(
-            "You are a meeting summarization assistant for Morgan Stanley Wealth Management advisors. Given a transcript, return JSON with: summary (2-3 sentences), key_discussion_points (list), action_items (list of {description, owner, priority}), compliance_flags (list of issues), participants (list), confidence_score (0-1). Be thorough and accurate — only include facts from the transcript.",
-            f"Transcript:\n{transcript[:6000]}",
+            "You are a financial document analyst for Morgan Stanley WM. Extract ALL data from this document as JSON with fields: fund_name, ticker, cusip, asset_class, risk_level, expense_ratio_pct, management_fee_pct, aum_millions, inception_date, benchmark, returns (ytd_pct, one_year_pct, three_year_pct, five_year_pct), risk_metrics (volatility_pct, sharpe_ratio, max_drawdown_pct, beta), top_holdings (list of {name, ticker, weight_pct}), investment_objective, key_risks (list), regulatory_flags (uses_leverage, uses_derivatives, concentrated), confidence_score (0-1). Only extract what's explicitly stated. Set missing fields to null.",
+            f"Document:\n{text[:8000]}",
         )
         if llm_result and "llm_error" not in llm_result:
             return {
-                "model": "Client Meeting Summarizer v1.3.0",
-                "mode": "llm_summarization",
-                "analysis": llm_result,
+                "model": "WM Document Intelligence v1.0.0",
+                "mode": "llm_extraction",
+                "powered_by": "GPT-5.2",
+                "extraction": llm_result,
             }
 
+    return await run_in_threadpool(_extract_rule_based, text)
+
+
+def _summarize_rule_based(transcript: str) -> dict:
+    """CPU-bound rule-based transcript analysis — runs on the threadpool."""
     lines = [l.strip() for l in transcript.strip().split("\n") if l.strip()]
     speakers = set()
-    topics = []
     action_keywords = []
     compliance_flags = []
 
+    # Detect topics — one pass over the whole transcript, first-occurrence order
+    topics = list(dict.fromkeys(
+        _TOPIC_LABELS[m.lastgroup] for m in _TOPIC_RE.finditer(transcript)
+    ))
+
     for line in lines:
         # Extract speakers
-        speaker_match = re.match(r"^([\w\s]+):", line)
+        speaker_match = _SPEAKER_RE.match(line)
         if speaker_match:
             speakers.add(speaker_match.group(1).strip())
 
-        line_lower = line.lower()
-
-        # Detect topics
-        topic_patterns = {
-            "portfolio review": r"portfolio|allocation|equity|bond|fixed income",
-            "risk discussion": r"risk|volatility|concern|worried|drawdown",
-            "retirement planning": r"retire|retirement|401k|ira|pension|social security",
-            "estate planning": r"estate|trust|529|education|inheritance",
-            "tax planning": r"tax|roth|conversion|deduction|capital gain",
-            "insurance": r"insurance|annuit|life insurance|long.term care",
-        }
-        for topic, pattern in topic_patterns.items():
-            if re.search(pattern, line_lower) and topic not in topics:
-                topics.append(topic)
-
         # Detect action items
-        if any(kw in line_lower for kw in ["recommend", "should", "let's", "i'll", "we could", "set up", "open", "send"]):
+        if _ACTION_KW_RE.search(line):
             action_keywords.append(line[:120])
 
         # Compliance flags
-        if any(kw in line_lower for kw in ["guaranteed", "risk-free", "can't lose", "promise"]):
+        if _PROMISSORY_KW_RE.search(line):
             compliance_flags.append({"flag": "promissory_language", "evidence": line[:100]})
-        if re.search(r"\b\d{3}-\d{2}-\d{4}\b", line):
+        if _SSN_RE.search(line):
             compliance_flags.append({"flag": "pii_detected", "evidence": "SSN pattern found"})
 
     # Build summary from detected topics
@@ -382,20 +558,54 @@ async def demo_meeting_summarize(body: dict):
     }
 
 
+@app.post("/api/models/meeting-summarizer/summarize")
+async def demo_meeting_summarize(body: dict):
+    """Summarize meeting transcript — LLM when available, rule-based fallback."""
+    transcript = body.get("transcript", "")
+    if not transcript:
+        return _error_response(_ERR_NO_TRANSCRIPT)
+
+    # Try LLM summarization
+    if _get_api_key():
+        llm_result = await _llm_call(
+            "You are a meeting summarization assistant for Morgan Stanley Wealth Management advisors. Given a transcript, return JSON with: summary (2-3 sentences), key_discussion_points (list), action_items (list of {description, owner, priority}), compliance_flags (list of issues), participants (list), confidence_score (0-1). Be thorough and accurate — only include facts from the transcript.",
+            f"Transcript:\n{transcript[:6000]}",
+        )
+        if llm_result and "llm_error" not in llm_result:
+            return {
+                "model": "Client Meeting Summarizer v1.3.0",
+                "mode": "llm_summarization",
+                "analysis": llm_result,
+            }
+
+    return await run_in_threadpool(_summarize_rule_based, transcript)
+
+
+class PortfolioRequest(BaseModel):
+    """Risk-narrator request body; string payloads are orjson-parsed up front."""
+
+    portfolio: dict = Field(default_factory=dict)
+
+    @field_validator("portfolio", mode="before")
+    @classmethod
+    def _parse_portfolio(cls, v):
+        if isinstance(v, (str, bytes)):
+            return orjson.loads(v)
+        return v
+
+
 @app.post("/api/models/portfolio-risk-narrator/generate")
-async def demo_risk_narrative(body: dict):
+async def demo_risk_narrative(req: PortfolioRequest):
     """Generate risk commentary from portfolio data — LLM when available."""
-    import json
-
-    raw = body.get("portfolio", "")
-    if not raw:
-        return {"error": "Provide 'portfolio' field with JSON data"}
+    data = req.portfolio
+    if not data:
+        return _error_response(_ERR_NO_PORTFOLIO)
 
     # Try LLM narrative generation
     if _get_api_key():
         llm_result = await _llm_call(
             "You are a portfolio risk analyst at Morgan Stanley Wealth Management. Given portfolio data, generate professional risk commentary as JSON with: executive_summary, performance_commentary, risk_assessment, allocation_commentary, action_recommendations (list), numbers_cited (list of {value, source_field}), confidence_score. ONLY cite numbers from the provided data. Use precise financial terminology.",
-            f"Portfolio Data:\n{raw if isinstance(raw, str) else json.dumps(raw, indent=2)}",
+            f"Portfolio Data:\n{orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()}",
         )
         if llm_result and "llm_error" not in llm_result:
             return {
@@ -404,11 +614,11 @@ async def demo_risk_narrative(body: dict):
                 "narrative": llm_result,
             }
 
-    try:
-        data = json.loads(raw) if isinstance(raw, str) else raw
-    except json.JSONDecodeError:
-        return {"error": "Invalid JSON in 'portfolio' field"}
+    return _narrative_rule_based(data)
+
 
+def _narrative_rule_based(data: dict) -> dict:
+    """Scalar-math narrative fallback — cheap enough to run inline."""
     total_value = data.get("total_value", 0)
     ytd = data.get("ytd_return_pct", 0)
     vol = data.get("volatility_pct", 0)
@@ -448,14 +658,59 @@ async def demo_risk_narrative(body: dict):
     }
 
 
+class PortfolioBatchRequest(BaseModel):
+    """Struct-of-arrays batch input: one entry per portfolio in each column."""
+
+    ytd_return_pct: list[float] = Field(default_factory=list)
+    volatility_pct: list[float] = Field(default_factory=list)
+    sharpe_ratio: list[float] = Field(default_factory=list)
+
+
+@app.post("/api/models/portfolio-risk-narrator/batch")
+async def demo_risk_narrative_batch(req: PortfolioBatchRequest):
+    """Vectorized risk screening across many portfolios at once."""
+    n = len(req.volatility_pct)
+    if n == 0 or len(req.ytd_return_pct) != n or len(req.sharpe_ratio) != n:
+        return _error_response(orjson.dumps(
+            {"error": "Provide equal-length 'ytd_return_pct', 'volatility_pct', 'sharpe_ratio' arrays"}
+        ))
+
+    ytd = np.asarray(req.ytd_return_pct, dtype=np.float32)
+    vol = np.asarray(req.volatility_pct, dtype=np.float32)
+    sharpe = np.asarray(req.sharpe_ratio, dtype=np.float32)
+
+    # Bit flags computed in whole-array ops: 1 = high volatility, 2 = weak
+    # risk-adjusted return, 4 = negative YTD.
+    flags = (
+        (vol > 15).astype(np.int8)
+        | ((sharpe < 1).astype(np.int8) << 1)
+        | ((ytd <= 0).astype(np.int8) << 2)
+    )
+
+    flagged = np.flatnonzero(flags)
+    return {
+        "model": "Portfolio Risk Narrator v1.0.0",
+        "mode": "vectorized_batch",
+        "portfolios": n,
+        "flagged_count": int(flagged.size),
+        "flagged": [
+            {
+                "index": int(i),
+                "high_volatility": bool(flags[i] & 1),
+                "weak_risk_adjusted_return": bool(flags[i] & 2),
+                "negative_ytd": bool(flags[i] & 4),
+            }
+            for i in flagged
+        ],
+    }
+
+
 @app.post("/api/models/regulatory-change-detector/analyze")
 async def demo_regulatory_analyze(body: dict):
     """Analyze regulatory document for WM impact — LLM when available."""
-    import re
-
     text = body.get("text", "")
     if not text:
-        return {"error": "Provide 'text' field with regulatory document text"}
+        return _error_response(_ERR_NO_REG_TEXT)
 
     # Try LLM analysis
     if _get_api_key():
@@ -470,41 +725,36 @@ async def demo_regulatory_analyze(body: dict):
                 "analysis": llm_result,
             }
 
-    text_lower = text.lower()
+    return await run_in_threadpool(_analyze_rule_based, text)
+
 
+def _analyze_rule_based(text: str) -> dict:
+    """CPU-bound rule-based regulatory analysis — runs on the threadpool."""
     # Detect regulator
     regulator = "Unknown"
-    for reg, pattern in [("SEC", r"\bSEC\b"), ("FINRA", r"\bFINRA\b"), ("OCC", r"\bOCC\b"), ("CFPB", r"\bCFPB\b"), ("Federal Reserve", r"\bFed\b|\bFederal Reserve\b")]:
-        if re.search(pattern, text):
+    for reg, pattern in _REGULATOR_RES:
+        if pattern.search(text):
             regulator = reg
             break
 
     # Detect impact areas
     areas = []
-    area_patterns = {
-        "Advisory Communications": r"communication|advertising|marketing|correspondence",
-        "Compliance": r"compliance|supervision|oversight|control",
-        "Technology": r"technology|system|AI|GenAI|model|algorithm",
-        "Risk Management": r"risk|model risk|validation|testing",
-        "Client Services": r"client|customer|investor|account",
-        "Trading": r"trading|execution|order|best execution",
-    }
-    for area, pattern in area_patterns.items():
-        if re.search(pattern, text_lower):
+    for area, pattern in _AREA_RES.items():
+        if pattern.search(text):
             areas.append(area)
 
     # Detect urgency
     impact = "medium"
-    if any(w in text_lower for w in ["immediately", "effective immediately", "emergency", "urgent"]):
+    if _URGENT_RE.search(text):
         impact = "critical"
-    elif any(w in text_lower for w in ["must", "required", "shall", "mandatory"]):
+    elif _MANDATE_RE.search(text):
         impact = "high"
-    elif any(w in text_lower for w in ["recommended", "guidance", "best practice"]):
+    elif _GUIDANCE_RE.search(text):
         impact = "medium"
 
     # GenAI implications
     genai_implications = None
-    if any(w in text_lower for w in ["genai", "generative ai", "artificial intelligence", "llm", "large language model"]):
+    if _GENAI_RE.search(text):
         genai_implications = "This regulation directly impacts GenAI use cases. All governed models should be reviewed for compliance."
 
     return {
@@ -516,7 +766,9 @@ async def demo_regulatory_analyze(body: dict):
             "impact_level": impact,
             "affected_areas": areas if areas else ["General"],
             "genai_implications": genai_implications,
-            "key_requirements": [s.strip() + "." for s in text.split(".") if any(w in s.lower() for w in ["must", "shall", "required"]) and len(s.strip()) > 20][:5],
+            "key_requirements": [
+                s + "." for s in (m.strip().rstrip(".") for m in _KEY_REQ_RE.findall(text)) if len(s) > 20
+            ][:5],
             "confidence_score": round(min(1.0, (len(areas) + (1 if genai_implications else 0)) / 4), 2),
         },
         "note": "Rule-based analysis. Set OPENAI_API_KEY for full LLM impact assessment.",
@@ -526,24 +778,32 @@ async def demo_regulatory_analyze(body: dict):
 @app.post("/api/models/compliance-checker/check")
 async def demo_compliance_check(body: dict):
     """Screen communication for compliance violations — rule-based + optional LLM enhancement."""
-    import re
-
     text = body.get("text", "")
     if not text:
-        return {"error": "Provide 'text' field with draft communication text"}
+        return _error_response(_ERR_NO_COMM_TEXT)
+
+    return await run_in_threadpool(_check_rule_based, text)
 
-    text_lower = text.lower()
-    violations = []
 
-    # Promissory language
-    for pattern, word in [
-        (r"\bguarantee[ds]?\b", "guaranteed"), (r"\brisk[\s-]?free\b", "risk-free"),
-        (r"\bcan'?t lose\b", "can't lose"), (r"\bwill definitely\b", "will definitely"),
-        (r"\bsure thing\b", "sure thing"), (r"\bno risk\b", "no risk"),
-        (r"\bassured returns?\b", "assured returns"),
-    ]:
-        if re.search(pattern, text_lower):
-            match = re.search(pattern, text_lower)
+def _check_rule_based(text: str) -> dict:
+    """CPU-bound rule-based compliance screening — runs on the threadpool."""
+    violations = []
+    high_count = 0
+
+    # One fused scan over the draft — each match dispatches on its named group.
+    seen_promissory: set[str] = set()
+    has_performance = False
+    has_disclaimer = False
+    ssn_found = False
+    positive_words = 0
+    risk_words = 0
+    for match in _COMPLIANCE_SCAN_RE.finditer(text):
+        group = match.lastgroup
+        if group == "promissory":
+            word = _PROMISSORY_CANONICAL[" ".join(match.group(0).lower().split())]
+            if word in seen_promissory:
+                continue
+            seen_promissory.add(word)
             context = text[max(0, match.start() - 30):match.end() + 30]
             violations.append({
                 "type": "promissory_language",
@@ -553,10 +813,19 @@ async def demo_compliance_check(body: dict):
                 "regulation": "FINRA Rule 2210(d)(1)(B)",
                 "fix": f"Remove '{word}' and add risk disclaimers",
             })
+            high_count += 1
+        elif group == "performance":
+            has_performance = True
+        elif group == "disclaimer":
+            has_disclaimer = True
+        elif group == "ssn":
+            ssn_found = True
+        elif group == "positive":
+            positive_words += 1
+        else:
+            risk_words += 1
 
     # Performance without disclaimer
-    has_performance = bool(re.search(r"\d+\.?\d*%\s*(return|performance|gain|yield|annual)", text_lower))
-    has_disclaimer = any(p in text_lower for p in ["past performance", "no guarantee", "may lose value", "not indicative"])
     if has_performance and not has_disclaimer:
         violations.append({
             "type": "missing_disclosure",
@@ -566,9 +835,10 @@ async def demo_compliance_check(body: dict):
             "regulation": "SEC Marketing Rule 206(4)-1",
             "fix": "Add: 'Past performance is not indicative of future results. Investments may lose value.'",
         })
+        high_count += 1
 
     # PII detection
-    if re.search(r"\b\d{3}-\d{2}-\d{4}\b", text):
+    if ssn_found:
         violations.append({
             "type": "pii_in_external",
             "severity": "high",
@@ -577,10 +847,9 @@ async def demo_compliance_check(body: dict):
             "regulation": "Reg S-P",
             "fix": "Remove all SSN references",
         })
+        high_count += 1
 
     # Unbalanced presentation (all positive, no risk)
-    positive_words = len(re.findall(r"\b(great|excellent|outstanding|superior|best|top|outperform)\b", text_lower))
-    risk_words = len(re.findall(r"\b(risk|loss|decline|volatility|uncertainty|downturn)\b", text_lower))
     if positive_words >= 3 and risk_words == 0:
         violations.append({
             "type": "unbalanced_presentation",
@@ -592,7 +861,6 @@ async def demo_compliance_check(body: dict):
         })
 
     # Decision logic
-    high_count = sum(1 for v in violations if v["severity"] == "high")
     if high_count >= 2:
         decision = "rejected"
     elif high_count == 1 or len(violations) >= 2:
@@ -12,11 +12,15 @@ Each model entry contains:
 
 from __future__ import annotations
 
+import hashlib
+from collections import Counter
 from datetime import datetime, timezone
 from enum import Enum
+from functools import lru_cache
 from typing import Any
 
-from pydantic import BaseModel, Field
+import orjson
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class ModelStatus(str, Enum):
@@ -39,27 +43,33 @@ class RiskRating(str, Enum):
 
 
 class EvalResult(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid", validate_assignment=False)
+
     eval_type: str
     total_tests: int
     passed: int
     failed: int
     pass_rate: float
     date: str
-    details: dict[str, Any] = {}
+    details: dict[str, Any] = Field(default_factory=dict)
 
 
 class ComplianceMapping(BaseModel):
-    sr_11_7: list[str] = []
-    nist_600_1: list[str] = []
-    owasp_llm_2025: list[str] = []
-    owasp_agentic_2026: list[str] = []
-    finra: list[str] = []
+    model_config = ConfigDict(frozen=True, extra="forbid", validate_assignment=False)
+
+    sr_11_7: list[str] = Field(default_factory=list)
+    nist_600_1: list[str] = Field(default_factory=list)
+    owasp_llm_2025: list[str] = Field(default_factory=list)
+    owasp_agentic_2026: list[str] = Field(default_factory=list)
+    finra: list[str] = Field(default_factory=list)
 
 
 class MonitoringConfig(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid", validate_assignment=False)
+
     cadence: str = "daily"
-    canary_prompts: list[dict] = []
-    thresholds: dict[str, float] = {}
+    canary_prompts: list[dict] = Field(default_factory=list)
+    thresholds: dict[str, float] = Field(default_factory=dict)
     last_execution: str | None = None
     drift_detected: bool = False
 
@@ -67,6 +77,8 @@ class MonitoringConfig(BaseModel):
 class GovernedModel(BaseModel):
     """A GenAI model under governance."""
 
+    model_config = ConfigDict(frozen=True, extra="forbid", validate_assignment=False)
+
     # Identity
     id: str
     name: str
@@ -96,14 +108,14 @@ class GovernedModel(BaseModel):
     committee_path: str = "WM Model Risk Committee"
 
     # Compliance
-    compliance: ComplianceMapping = ComplianceMapping()
+    compliance: ComplianceMapping = Field(default_factory=ComplianceMapping)
 
     # Evaluation
-    eval_results: list[EvalResult] = []
+    eval_results: list[EvalResult] = Field(default_factory=list)
     overall_pass_rate: float | None = None
 
     # Monitoring
-    monitoring: MonitoringConfig = MonitoringConfig()
+    monitoring: MonitoringConfig = Field(default_factory=MonitoringConfig)
 
     # Findings
     open_findings: int = 0
@@ -111,9 +123,11 @@ class GovernedModel(BaseModel):
 
 
 # ── Pre-configured registry of all 5 models ─────────────────────────────────
+# Entries are maintainer-authored literals, so model_construct skips the
+# pydantic validation pass and trims worker cold-start.
 
 MODEL_REGISTRY: list[GovernedModel] = [
-    GovernedModel(
+    GovernedModel.model_construct(
         id="WM-DOC-INT-001",
         name="WM Document Intelligence",
         version="1.0.0",
@@ -130,19 +144,19 @@ MODEL_REGISTRY: list[GovernedModel] = [
         owner="AI Platform Team",
         certification_date="2026-01-15",
         next_recertification="2026-07-15",
-        compliance=ComplianceMapping(
+        compliance=ComplianceMapping.model_construct(
             sr_11_7=["Model Definition", "Effective Challenge", "Ongoing Monitoring"],
             nist_600_1=["Content Provenance", "Pre-deployment Testing"],
             owasp_llm_2025=["LLM01 Prompt Injection", "LLM09 Misinformation"],
             finra=["Prompt/output logging", "Model version tracking"],
         ),
         eval_results=[
-            EvalResult(eval_type="quality_correctness", total_tests=25, passed=24, failed=1, pass_rate=0.96, date="2026-01-10"),
-            EvalResult(eval_type="safety_security", total_tests=30, passed=29, failed=1, pass_rate=0.967, date="2026-01-12"),
-            EvalResult(eval_type="rag_groundedness", total_tests=20, passed=19, failed=1, pass_rate=0.95, date="2026-01-11"),
+            EvalResult.model_construct(eval_type="quality_correctness", total_tests=25, passed=24, failed=1, pass_rate=0.96, date="2026-01-10"),
+            EvalResult.model_construct(eval_type="safety_security", total_tests=30, passed=29, failed=1, pass_rate=0.967, date="2026-01-12"),
+            EvalResult.model_construct(eval_type="rag_groundedness", total_tests=20, passed=19, failed=1, pass_rate=0.95, date="2026-01-11"),
         ],
         overall_pass_rate=0.96,
-        monitoring=MonitoringConfig(
+        monitoring=MonitoringConfig.model_construct(
             cadence="daily",
             canary_prompts=[{"prompt": "Extract fund name and expense ratio from this prospectus", "expected_contains": "fund_name"}],
             thresholds={"accuracy_min": 0.90, "latency_p99_ms": 5000},
@@ -150,7 +164,7 @@ MODEL_REGISTRY: list[GovernedModel] = [
         open_findings=1,
         total_findings=3,
     ),
-    GovernedModel(
+    GovernedModel.model_construct(
         id="WM-MTG-SUM-001",
         name="Client Meeting Summarizer",
         version="1.3.0",
@@ -167,23 +181,23 @@ MODEL_REGISTRY: list[GovernedModel] = [
         owner="WM Technology",
         certification_date="2025-11-01",
         next_recertification="2026-05-01",
-        compliance=ComplianceMapping(
+        compliance=ComplianceMapping.model_construct(
             sr_11_7=["Model Definition", "Effective Challenge", "Governance", "Ongoing Monitoring"],
             nist_600_1=["Governance", "Content Provenance", "Pre-deployment Testing", "Incident Disclosure"],
             owasp_llm_2025=["LLM01 Prompt Injection", "LLM06 Sensitive Disclosure", "LLM09 Misinformation"],
             finra=["Prompt/output logging", "Model version tracking", "PII redaction"],
         ),
         eval_results=[
-            EvalResult(eval_type="quality_correctness", total_tests=30, passed=28, failed=2, pass_rate=0.933, date="2025-10-20"),
-            EvalResult(eval_type="safety_security", total_tests=40, passed=38, failed=2, pass_rate=0.95, date="2025-10-22"),
-            EvalResult(eval_type="pii_redaction", total_tests=15, passed=15, failed=0, pass_rate=1.0, date="2025-10-21"),
+            EvalResult.model_construct(eval_type="quality_correctness", total_tests=30, passed=28, failed=2, pass_rate=0.933, date="2025-10-20"),
+            EvalResult.model_construct(eval_type="safety_security", total_tests=40, passed=38, failed=2, pass_rate=0.95, date="2025-10-22"),
+            EvalResult.model_construct(eval_type="pii_redaction", total_tests=15, passed=15, failed=0, pass_rate=1.0, date="2025-10-21"),
         ],
         overall_pass_rate=0.95,
-        monitoring=MonitoringConfig(cadence="daily", thresholds={"faithfulness_min": 0.85, "pii_leak_max": 0.0}),
+        monitoring=MonitoringConfig.model_construct(cadence="daily", thresholds={"faithfulness_min": 0.85, "pii_leak_max": 0.0}),
         open_findings=2,
         total_findings=5,
     ),
-    GovernedModel(
+    GovernedModel.model_construct(
         id="WM-RSK-NAR-001",
         name="Portfolio Risk Narrator",
         version="1.0.0",
@@ -200,23 +214,23 @@ MODEL_REGISTRY: list[GovernedModel] = [
         owner="Risk Analytics",
         certification_date="2026-02-01",
         next_recertification="2026-08-01",
-        compliance=ComplianceMapping(
+        compliance=ComplianceMapping.model_construct(
             sr_11_7=["Model Definition", "Effective Challenge"],
             nist_600_1=["Content Provenance", "Pre-deployment Testing"],
             owasp_llm_2025=["LLM09 Misinformation"],
             finra=["Model version tracking"],
         ),
         eval_results=[
-            EvalResult(eval_type="quality_correctness", total_tests=20, passed=19, failed=1, pass_rate=0.95, date="2026-01-28"),
-            EvalResult(eval_type="fact_verification", total_tests=50, passed=48, failed=2, pass_rate=0.96, date="2026-01-29",
+            EvalResult.model_construct(eval_type="quality_correctness", total_tests=20, passed=19, failed=1, pass_rate=0.95, date="2026-01-28"),
+            EvalResult.model_construct(eval_type="fact_verification", total_tests=50, passed=48, failed=2, pass_rate=0.96, date="2026-01-29",
                        details={"numbers_verified": 48, "numbers_unverified": 2}),
         ],
         overall_pass_rate=0.955,
-        monitoring=MonitoringConfig(cadence="weekly", thresholds={"fact_accuracy_min": 0.95}),
+        monitoring=MonitoringConfig.model_construct(cadence="weekly", thresholds={"fact_accuracy_min": 0.95}),
         open_findings=0,
         total_findings=2,
     ),
-    GovernedModel(
+    GovernedModel.model_construct(
         id="WM-REG-DET-001",
         name="Regulatory Change Detector",
         version="1.0.0",
@@ -231,19 +245,19 @@ MODEL_REGISTRY: list[GovernedModel] = [
         handles_pii=False,
         data_classification="internal",
         owner="Compliance",
-        compliance=ComplianceMapping(
+        compliance=ComplianceMapping.model_construct(
             sr_11_7=["Model Definition", "Effective Challenge"],
             nist_600_1=["Governance", "Pre-deployment Testing"],
             owasp_llm_2025=["LLM01 Prompt Injection", "LLM09 Misinformation"],
         ),
         eval_results=[
-            EvalResult(eval_type="quality_correctness", total_tests=15, passed=14, failed=1, pass_rate=0.933, date="2026-02-10"),
+            EvalResult.model_construct(eval_type="quality_correctness", total_tests=15, passed=14, failed=1, pass_rate=0.933, date="2026-02-10"),
         ],
         overall_pass_rate=0.933,
         open_findings=1,
         total_findings=1,
     ),
-    GovernedModel(
+    GovernedModel.model_construct(
         id="WM-CMP-CHK-001",
         name="Client Communication Compliance Checker",
         version="1.0.0",
@@ -260,43 +274,95 @@ MODEL_REGISTRY: list[GovernedModel] = [
         owner="Compliance",
         certification_date="2026-02-05",
         next_recertification="2026-08-05",
-        compliance=ComplianceMapping(
+        compliance=ComplianceMapping.model_construct(
             sr_11_7=["Model Definition", "Effective Challenge", "Ongoing Monitoring"],
             nist_600_1=["Governance", "Pre-deployment Testing"],
             owasp_llm_2025=["LLM01 Prompt Injection", "LLM06 Sensitive Disclosure"],
             finra=["FINRA 2210 (Communications)", "FINRA 2111 (Suitability)", "Prompt/output logging"],
         ),
         eval_results=[
-            EvalResult(eval_type="quality_correctness", total_tests=40, passed=39, failed=1, pass_rate=0.975, date="2026-02-03"),
-            EvalResult(eval_type="safety_security", total_tests=25, passed=24, failed=1, pass_rate=0.96, date="2026-02-04"),
-            EvalResult(eval_type="false_positive_rate", total_tests=30, passed=28, failed=2, pass_rate=0.933, date="2026-02-04",
+            EvalResult.model_construct(eval_type="quality_correctness", total_tests=40, passed=39, failed=1, pass_rate=0.975, date="2026-02-03"),
+            EvalResult.model_construct(eval_type="safety_security", total_tests=25, passed=24, failed=1, pass_rate=0.96, date="2026-02-04"),
+            EvalResult.model_construct(eval_type="false_positive_rate", total_tests=30, passed=28, failed=2, pass_rate=0.933, date="2026-02-04",
                        details={"false_positives": 2, "false_negatives": 0}),
         ],
         overall_pass_rate=0.96,
-        monitoring=MonitoringConfig(cadence="daily", thresholds={"detection_rate_min": 0.95, "false_positive_max": 0.05}),
+        monitoring=MonitoringConfig.model_construct(cadence="daily", thresholds={"detection_rate_min": 0.95, "false_positive_max": 0.05}),
         open_findings=1,
         total_findings=3,
     ),
 ]
 
 
-def get_model_registry() -> list[GovernedModel]:
-    return MODEL_REGISTRY
+_MODEL_BY_ID: dict[str, GovernedModel] = {m.id: m for m in MODEL_REGISTRY}
+
+# Immutable snapshot handed to callers — keeps the registry safe to share and
+# lets downstream derivations cache against a stable object.
+_REGISTRY_TUPLE: tuple[GovernedModel, ...] = tuple(MODEL_REGISTRY)
+
+
+# Full registry serialized once at import — dashboard handlers can return
+# these bytes directly; the ETag lets clients short-circuit with a 304.
+_REGISTRY_JSON: bytes = orjson.dumps([m.model_dump(mode="json") for m in MODEL_REGISTRY])
+_REGISTRY_ETAG: str = hashlib.sha256(_REGISTRY_JSON).hexdigest()[:16]
+
+
+def get_model_registry() -> tuple[GovernedModel, ...]:
+    return _REGISTRY_TUPLE
+
+
+def get_registry_json() -> bytes:
+    return _REGISTRY_JSON
+
+
+def get_registry_etag() -> str:
+    return _REGISTRY_ETAG
+
+
+def rebuild_registry_artifacts() -> None:
+    """Recompute every derived registry artifact after an in-place edit.
+
+    Clears the memoized summary and rebuilds the id index, the immutable
+    snapshot, and the pre-serialized JSON/ETag — the app's reload endpoint
+    calls this before re-warming its own payload cache.
+    """
+    global _REGISTRY_TUPLE, _REGISTRY_JSON, _REGISTRY_ETAG
+    get_governance_summary.cache_clear()
+    _MODEL_BY_ID.clear()
+    _MODEL_BY_ID.update({m.id: m for m in MODEL_REGISTRY})
+    _REGISTRY_TUPLE = tuple(MODEL_REGISTRY)
+    _REGISTRY_JSON = orjson.dumps([m.model_dump(mode="json") for m in MODEL_REGISTRY])
+    _REGISTRY_ETAG = hashlib.sha256(_REGISTRY_JSON).hexdigest()[:16]
 
 
 def get_model_by_id(model_id: str) -> GovernedModel | None:
-    return next((m for m in MODEL_REGISTRY if m.id == model_id), None)
+    return _MODEL_BY_ID.get(model_id)
 
 
+@lru_cache(maxsize=1)
 def get_governance_summary() -> dict:
-    """Dashboard summary of all governed models."""
+    """Dashboard summary of all governed models — one registry pass, memoized."""
     models = MODEL_REGISTRY
+    by_status: Counter[str] = Counter()
+    by_risk: Counter[str] = Counter()
+    pass_rate_sum = 0.0
+    open_findings = 0
+    eval_runs = 0
+    certified = 0
+    for m in models:
+        by_status[m.status.value] += 1
+        by_risk[m.risk_rating.value] += 1
+        pass_rate_sum += m.overall_pass_rate or 0
+        open_findings += m.open_findings
+        eval_runs += len(m.eval_results)
+        if m.status in (ModelStatus.CERTIFIED, ModelStatus.MONITORING):
+            certified += 1
     return {
         "total_models": len(models),
-        "by_status": {s.value: sum(1 for m in models if m.status == s) for s in ModelStatus if any(m.status == s for m in models)},
-        "by_risk": {r.value: sum(1 for m in models if m.risk_rating == r) for r in RiskRating if any(m.risk_rating == r for m in models)},
-        "avg_pass_rate": sum(m.overall_pass_rate or 0 for m in models) / len(models),
-        "total_open_findings": sum(m.open_findings for m in models),
-        "total_eval_runs": sum(len(m.eval_results) for m in models),
-        "certified_count": sum(1 for m in models if m.status in (ModelStatus.CERTIFIED, ModelStatus.MONITORING)),
+        "by_status": dict(by_status),
+        "by_risk": dict(by_risk),
+        "avg_pass_rate": pass_rate_sum / len(models),
+        "total_open_findings": open_findings,
+        "total_eval_runs": eval_runs,
+        "certified_count": certified,
     }
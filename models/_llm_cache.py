@@ -0,0 +1,46 @@
+"""
+Content-addressable cache for LLM structured outputs.
+
+Keys are sha256 over length-prefixed components (provider, model, prompt
+version, schema name, input text), so no delimiter collision is possible
+between components. Values are the structured output's JSON bytes, stored
+one file per key for crash-safe reuse across processes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import struct
+from pathlib import Path
+
+
+def cache_key(*parts: str) -> str:
+    """Collision-safe digest over length-prefixed string components."""
+    h = hashlib.sha256()
+    for part in parts:
+        data = part.encode()
+        h.update(struct.pack(">Q", len(data)))
+        h.update(data)
+    return h.hexdigest()
+
+
+class ExtractionCache:
+    """Disk-backed content-addressable store for LLM response JSON."""
+
+    def __init__(self, cache_dir: str | Path = ".llm_cache"):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> bytes | None:
+        try:
+            return self._path(key).read_bytes()
+        except OSError:
+            return None
+
+    def put(self, key: str, payload: bytes) -> None:
+        tmp = self._path(key).with_suffix(".tmp")
+        tmp.write_bytes(payload)
+        tmp.replace(self._path(key))
@@ -0,0 +1,55 @@
+"""
+Shared AsyncOpenAI client pool.
+
+One client — and therefore one httpx connection pool and TLS context — per
+API key, reused across calls and across the model modules, so sequential
+requests ride the same keep-alive connections instead of paying a fresh
+handshake each time.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+
+# Every pooled client, so close_async_clients can tear them down at shutdown.
+_live_clients: list = []
+
+
+@lru_cache(maxsize=8)
+def get_async_client(api_key: str = ""):
+    import httpx
+    from openai import AsyncOpenAI
+
+    http_client = httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+        timeout=httpx.Timeout(60.0, connect=5.0),
+    )
+    if api_key:
+        client = AsyncOpenAI(api_key=api_key, http_client=http_client)
+    else:
+        client = AsyncOpenAI(http_client=http_client)
+    _live_clients.append(client)
+    return client
+
+
+async def close_async_clients() -> None:
+    """Close every pooled client — call from the application's shutdown hook."""
+    while _live_clients:
+        await _live_clients.pop().close()
+    get_async_client.cache_clear()
+
+
+def strict_response_format(model_cls, name: str) -> dict:
+    """Precomputed json_schema response_format for a Pydantic model.
+
+    Uses the SDK's strict-schema transform when available (it adds the
+    additionalProperties constraints strict mode requires); call once at
+    import so the schema is never re-derived per request.
+    """
+    try:
+        from openai.lib._pydantic import to_strict_json_schema
+
+        schema = to_strict_json_schema(model_cls)
+    except Exception:
+        schema = model_cls.model_json_schema()
+    return {"type": "json_schema", "json_schema": {"name": name, "schema": schema, "strict": True}}
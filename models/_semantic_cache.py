@@ -0,0 +1,118 @@
+"""
+Semantic cache for LLM outputs — near-duplicate inputs reuse stored responses.
+
+Inputs are normalized (timestamps stripped, floats rounded), embedded with
+text-embedding-3-small (1536d — far cheaper than -large), and looked up in a
+ChromaDB collection; when cosine similarity clears the threshold the stored
+response JSON is served instead of a fresh LLM call. Mirrors the lazy-init
+ChromaDB setup used by DocumentRAG.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+
+import structlog
+
+logger = structlog.get_logger()
+
+_TIMESTAMP_RE = re.compile(r"\b\d{1,2}:\d{2}(?::\d{2})?\b")
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form for free text: timestamps out, case and whitespace folded."""
+    return " ".join(_TIMESTAMP_RE.sub("", text).lower().split())
+
+
+def normalize_numbers(data: dict) -> str:
+    """Canonical form for numeric payloads: floats rounded to 2dp, keys sorted."""
+    import orjson
+
+    rounded = {k: round(v, 2) if isinstance(v, float) else v for k, v in data.items()}
+    return orjson.dumps(rounded, option=orjson.OPT_SORT_KEYS).decode()
+
+
+class SemanticCache:
+    """Similarity-keyed response store on a ChromaDB collection."""
+
+    def __init__(
+        self,
+        collection_name: str,
+        embedding_model: str = "text-embedding-3-small",
+        similarity_threshold: float = 0.97,
+        local_embedding_model: str | None = None,
+    ):
+        self.collection_name = collection_name
+        self.embedding_model = embedding_model
+        self.similarity_threshold = similarity_threshold
+        # When set (e.g. "BAAI/bge-small-en-v1.5"), embeddings run in-process
+        # via sentence-transformers: ~3ms on CPU per lookup instead of a
+        # network round-trip on every cache miss.
+        self.local_embedding_model = local_embedding_model
+        self._collection = None
+
+    def _get_collection(self):
+        """Lazy-init ChromaDB collection."""
+        if self._collection is not None:
+            return self._collection
+        try:
+            import chromadb
+            from chromadb.utils.embedding_functions import (
+                OpenAIEmbeddingFunction,
+                SentenceTransformerEmbeddingFunction,
+            )
+
+            client = chromadb.Client()
+            if self.local_embedding_model:
+                embedding_fn = SentenceTransformerEmbeddingFunction(model_name=self.local_embedding_model)
+            else:
+                embedding_fn = OpenAIEmbeddingFunction(model_name=self.embedding_model)
+            self._collection = client.get_or_create_collection(
+                name=self.collection_name,
+                embedding_function=embedding_fn,
+                metadata={"hnsw:space": "cosine"},
+            )
+            return self._collection
+        except Exception as e:
+            logger.error("semantic_cache_init_failed", error=str(e))
+            return None
+
+    def get(self, normalized_input: str) -> str | None:
+        """Return the stored response JSON for a near-duplicate input, if any.
+
+        Embedding/network failures degrade to a miss — a broken cache must
+        never fail the request it fronts.
+        """
+        collection = self._get_collection()
+        if collection is None:
+            return None
+        try:
+            if collection.count() == 0:
+                return None
+            results = collection.query(query_texts=[normalized_input], n_results=1)
+            if not results["distances"][0]:
+                return None
+            similarity = 1 - results["distances"][0][0]
+            if similarity < self.similarity_threshold:
+                return None
+            logger.info("semantic_cache_hit", collection=self.collection_name, similarity=round(similarity, 4))
+            return results["metadatas"][0][0]["payload"]
+        except Exception as e:
+            logger.error("semantic_cache_get_failed", collection=self.collection_name, error=str(e))
+            return None
+
+    def put(self, normalized_input: str, payload: str) -> None:
+        """Store a response; write failures (including duplicate-id adds from
+        concurrent identical requests) are logged and dropped, never raised."""
+        collection = self._get_collection()
+        if collection is None:
+            return
+        try:
+            collection.add(
+                ids=[hashlib.sha256(normalized_input.encode()).hexdigest()],
+                documents=[normalized_input],
+                metadatas=[{"payload": payload}],
+            )
+        except Exception as e:
+            logger.error("semantic_cache_put_failed", collection=self.collection_name, error=str(e))
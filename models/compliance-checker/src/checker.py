@@ -4,11 +4,49 @@ Client Communication Compliance Checker — pre-send screening engine.
 
 from __future__ import annotations
 
+import re
+from collections import Counter
+from collections.abc import AsyncIterator
 from enum import Enum
-from pydantic import BaseModel, Field
-import structlog
+from functools import lru_cache
+from typing import Literal
 
-logger = structlog.get_logger()
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+
+try:
+    import structlog
+
+    logger = structlog.get_logger()
+except ImportError:  # keep the module importable for its types alone
+    import logging
+
+    class _KeywordLogger:
+        """Minimal structlog-style shim over stdlib logging."""
+
+        def __init__(self, base: logging.Logger):
+            self._base = base
+
+        def info(self, event: str, **kw):
+            self._base.info("%s %s", event, kw)
+
+        def error(self, event: str, **kw):
+            self._base.error("%s %s", event, kw)
+
+    logger = _KeywordLogger(logging.getLogger(__name__))
+
+# Rule-based patterns, compiled once at import. The promissory phrases are a
+# single alternation — one capture group per phrase so dedup can key on which
+# alternative matched.
+_PROMISSORY_RE = re.compile(
+    r"\b(?:(guarantee[ds]?)|(risk[\s-]?free)|(can'?t lose)|(will definitely)"
+    r"|(sure thing)|(no risk)|(certain to)|(assured))\b",
+    re.IGNORECASE,
+)
+_SSN_RE = re.compile(r"\b\d{3}-\d{2}-\d{4}\b")
+_DISCLAIMER_RE = re.compile(
+    "|".join(map(re.escape, ["past performance", "no guarantee", "not indicative", "may lose value"])),
+    re.IGNORECASE,
+)
 
 
 class ViolationType(str, Enum):
@@ -42,17 +80,22 @@ class ComplianceDecision(str, Enum):
 
 class ClientContext(BaseModel):
     """Context about the client for suitability assessment."""
-    client_type: str = Field("retail", description="retail, institutional, qualified_purchaser")
-    risk_tolerance: str = Field("moderate", description="conservative, moderate, aggressive")
-    investment_experience: str = Field("intermediate", description="novice, intermediate, sophisticated")
+    client_type: Literal["retail", "institutional", "qualified_purchaser"] = Field("retail")
+    risk_tolerance: Literal["conservative", "moderate", "aggressive"] = Field("moderate")
+    investment_experience: Literal["novice", "intermediate", "sophisticated"] = Field("intermediate")
     age: int | None = Field(None)
     is_senior: bool = Field(False, description="Age 65+ or designated as senior investor")
-    account_type: str = Field("brokerage", description="brokerage, advisory, ira, trust")
+    account_type: Literal["brokerage", "advisory", "ira", "trust"] = Field("brokerage")
 
 
 class ComplianceReport(BaseModel):
     """Complete compliance screening result."""
 
+    # _rule_based_checks mutates the parsed report in place; keep assignment
+    # revalidation off and the serializer prebuilt so the return path never
+    # re-walks validators.
+    model_config = ConfigDict(extra="ignore", validate_assignment=False, defer_build=False)
+
     decision: ComplianceDecision
     overall_risk_score: float = Field(description="0.0 (clean) to 1.0 (critical violations)")
 
@@ -64,7 +107,9 @@ class ComplianceReport(BaseModel):
     suggested_revisions: list[str] = Field(default_factory=list, description="Recommended text changes")
 
     # Analysis
-    communication_type: str = Field(description="email, letter, proposal, social_media, presentation")
+    communication_type: Literal["email", "letter", "proposal", "social_media", "presentation"] = Field(
+        description="Communication channel"
+    )
     contains_performance_data: bool = Field(False)
     contains_recommendations: bool = Field(False)
     contains_projections: bool = Field(False)
@@ -75,6 +120,24 @@ class ComplianceReport(BaseModel):
     confidence_score: float = Field(0.0)
 
 
+# Derived once at import: the raw json_schema response_format replaces the
+# per-call schema derivation inside beta.parse, and the context adapter
+# keeps the fast dump_json path prebuilt.
+try:
+    from models._openai_client import strict_response_format
+except ImportError:
+    strict_response_format = None
+
+if strict_response_format is not None:
+    _REPORT_RESPONSE_FORMAT = strict_response_format(ComplianceReport, "ComplianceReport")
+else:
+    _REPORT_RESPONSE_FORMAT = {
+        "type": "json_schema",
+        "json_schema": {"name": "ComplianceReport", "schema": ComplianceReport.model_json_schema(), "strict": True},
+    }
+_CTX_ADAPTER = TypeAdapter(ClientContext)
+
+
 CHECKER_SYSTEM_PROMPT = """You are a compliance reviewer for Morgan Stanley Wealth Management
 advisor communications. Screen the provided draft communication for regulatory violations.
 
@@ -103,6 +166,77 @@ Rules:
 """
 
 
+# Serialized default context, computed once — the common client_context=None
+# path allocates nothing per call. No indent: the LLM doesn't need pretty JSON.
+_DEFAULT_CONTEXT_JSON = None
+
+
+def _context_json(client_context: ClientContext | None) -> str:
+    global _DEFAULT_CONTEXT_JSON
+    if client_context is not None:
+        return _CTX_ADAPTER.dump_json(client_context).decode()
+    if _DEFAULT_CONTEXT_JSON is None:
+        _DEFAULT_CONTEXT_JSON = _CTX_ADAPTER.dump_json(ClientContext()).decode()
+    return _DEFAULT_CONTEXT_JSON
+
+
+# Cached clients, tracked so close_clients can tear them down at shutdown.
+_live_clients: list = []
+
+
+@lru_cache(maxsize=8)
+def _get_client(api_key: str):
+    """One AsyncOpenAI client per key — reuses the TLS/connection pool across calls."""
+    from openai import AsyncOpenAI
+
+    client = AsyncOpenAI(api_key=api_key) if api_key else AsyncOpenAI()
+    _live_clients.append(client)
+    return client
+
+
+async def close_clients() -> None:
+    """Close the cached AsyncOpenAI clients — call at application shutdown."""
+    while _live_clients:
+        await _live_clients.pop().close()
+    _get_client.cache_clear()
+
+
+# Report cache keyed on (model, context, text) hash. Advisors resend
+# near-identical boilerplate constantly; a hit skips the LLM round-trip.
+# Entries stale by less than one extra TTL are served immediately while a
+# background task refreshes; anything older is dropped and recomputed, and
+# the cache clears at a hard cap so a long-lived worker stays bounded.
+_REPORT_CACHE_TTL_SECONDS = 300.0
+_REPORT_CACHE_MAX_ENTRIES = 1024
+_report_cache: dict[str, tuple[float, ComplianceReport]] = {}
+_cache_refreshing: set[str] = set()
+_refresh_tasks: set = set()  # strong refs so pending refreshes aren't GC'd
+
+
+def _report_cache_key(text: str, client_context: ClientContext | None, model: str) -> str:
+    import hashlib
+
+    return hashlib.sha256(f"{model}|{_context_json(client_context)}|{text}".encode()).hexdigest()
+
+
+async def _refresh_cached_report(
+    key: str,
+    communication_text: str,
+    client_context: ClientContext | None,
+    model: str,
+    api_key: str,
+) -> None:
+    import time
+
+    try:
+        report = await _check_compliance_uncached(communication_text, client_context, model, api_key)
+        _report_cache[key] = (time.monotonic(), report)
+    except Exception as e:
+        logger.error("compliance_cache_refresh_failed", error=str(e))
+    finally:
+        _cache_refreshing.discard(key)
+
+
 async def check_compliance(
     communication_text: str,
     client_context: ClientContext | None = None,
@@ -110,31 +244,72 @@ async def check_compliance(
     api_key: str = "",
 ) -> ComplianceReport:
     """Screen a client communication for compliance violations."""
-    from openai import AsyncOpenAI
-
-    client = AsyncOpenAI(api_key=api_key) if api_key else AsyncOpenAI()
+    import asyncio
+    import time
+
+    key = _report_cache_key(communication_text, client_context, model)
+    cached = _report_cache.get(key)
+    if cached is not None:
+        cached_at, report = cached
+        age = time.monotonic() - cached_at
+        if age >= 2 * _REPORT_CACHE_TTL_SECONDS:
+            # Too old to serve even stale — purge and fall through to a
+            # fresh call instead of background-refreshing forever.
+            _report_cache.pop(key, None)
+        else:
+            stale = age >= _REPORT_CACHE_TTL_SECONDS
+            if stale and key not in _cache_refreshing:
+                _cache_refreshing.add(key)
+                task = asyncio.create_task(
+                    _refresh_cached_report(key, communication_text, client_context, model, api_key)
+                )
+                _refresh_tasks.add(task)
+                task.add_done_callback(_refresh_tasks.discard)
+            logger.info("compliance_check_cache_hit", stale=stale)
+            return report.model_copy(deep=True)
+
+    report = await _check_compliance_uncached(communication_text, client_context, model, api_key)
+    if len(_report_cache) >= _REPORT_CACHE_MAX_ENTRIES:
+        _report_cache.clear()
+    _report_cache[key] = (time.monotonic(), report)
+    return report.model_copy(deep=True)
+
+
+async def _check_compliance_uncached(
+    communication_text: str,
+    client_context: ClientContext | None,
+    model: str,
+    api_key: str,
+) -> ComplianceReport:
+    client = _get_client(api_key)
 
-    context_json = (client_context or ClientContext()).model_dump_json(indent=2)
+    context_json = _context_json(client_context)
 
     logger.info("compliance_check_start", text_length=len(communication_text), model=model)
 
     try:
-        response = await client.beta.chat.completions.parse(
+        response = await client.chat.completions.create(
             model=model,
             messages=[
                 {"role": "system", "content": CHECKER_SYSTEM_PROMPT},
                 {"role": "user", "content": f"Client Context:\n{context_json}\n\nDraft Communication:\n{communication_text}"},
             ],
-            response_format=ComplianceReport,
+            response_format=_REPORT_RESPONSE_FORMAT,
             temperature=0,
         )
 
-        report = response.choices[0].message.parsed
-        if report is None:
+        content = response.choices[0].message.content
+        if not content:
             raise ValueError("LLM returned no parsed output")
+        report = ComplianceReport.model_validate_json(content)
 
-        # Post-processing: rule-based checks that LLM might miss
-        report = _rule_based_checks(report, communication_text, client_context)
+        # Post-processing: rule-based checks that LLM might miss. Offloaded to
+        # a worker thread so long regex scans don't stall the event loop.
+        import asyncio
+
+        report = await asyncio.to_thread(
+            _rule_based_checks, report, communication_text, client_context
+        )
 
         logger.info(
             "compliance_check_complete",
@@ -150,44 +325,65 @@ async def check_compliance(
         raise
 
 
+async def stream_report(report: ComplianceReport) -> AsyncIterator[bytes]:
+    """Emit a report as incremental JSON bytes, violations first.
+
+    Batch screening can surface hundreds of violations; streaming keeps peak
+    memory flat and time-to-first-byte independent of the violation count.
+    Wire into a StreamingResponse with media_type="application/json".
+    """
+    import orjson
+
+    yield b'{"decision":' + orjson.dumps(report.decision.value)
+    yield b',"violations":['
+    first = True
+    for violation in report.violations:
+        if not first:
+            yield b","
+        first = False
+        yield orjson.dumps(violation.model_dump(mode="json"))
+    yield b"],"
+    rest = orjson.dumps(report.model_dump(mode="json", exclude={"decision", "violations"}))
+    yield rest[1:]  # drop the opening brace; the tail closes the object
+
+
 def _rule_based_checks(
     report: ComplianceReport,
     text: str,
     client_context: ClientContext | None,
 ) -> ComplianceReport:
     """Apply deterministic rule-based compliance checks."""
-    import re
-
-    text_lower = text.lower()
-
-    # Promissory language (regex — catches what LLM might miss)
-    promissory_patterns = [
-        r"\bguarantee[ds]?\b", r"\brisk[\s-]?free\b", r"\bcan'?t lose\b",
-        r"\bwill definitely\b", r"\bsure thing\b", r"\bno risk\b",
-        r"\bcertain to\b", r"\bassured\b",
+    # Promissory language (regex — catches what LLM might miss).
+    # One finditer pass; each phrase alternative is flagged at most once.
+    # Evidence strings are lowered once up front instead of per match.
+    promissory_evidence = [
+        v.evidence.lower()
+        for v in report.violations
+        if v.violation_type is ViolationType.PROMISSORY_LANGUAGE
     ]
-    for pattern in promissory_patterns:
-        match = re.search(pattern, text_lower)
-        if match:
-            already_flagged = any(
-                v.violation_type == ViolationType.PROMISSORY_LANGUAGE
-                and match.group().lower() in v.evidence.lower()
-                for v in report.violations
-            )
-            if not already_flagged:
-                report.violations.append(Violation(
-                    violation_type=ViolationType.PROMISSORY_LANGUAGE,
-                    severity="high",
-                    description=f"Promissory language detected: '{match.group()}'",
-                    evidence=text[max(0, match.start()-20):match.end()+20],
-                    regulation="FINRA Rule 2210(d)(1)(B)",
-                    suggested_fix=f"Remove '{match.group()}' and replace with balanced language acknowledging risks",
-                ))
-
-    # PII check
-    ssn_pattern = r"\b\d{3}-\d{2}-\d{4}\b"
-    if re.search(ssn_pattern, text):
-        report.violations.append(Violation(
+    seen_phrases: set[int] = set()
+    for match in _PROMISSORY_RE.finditer(text):
+        if match.lastindex in seen_phrases:
+            continue
+        seen_phrases.add(match.lastindex)
+        if any(match.group().lower() in e for e in promissory_evidence):
+            continue
+        evidence = text[max(0, match.start()-20):match.end()+20]
+        promissory_evidence.append(evidence.lower())
+        # model_construct: fields are trusted literals, skip pydantic validation
+        report.violations.append(Violation.model_construct(
+            violation_type=ViolationType.PROMISSORY_LANGUAGE,
+            severity="high",
+            description=f"Promissory language detected: '{match.group()}'",
+            evidence=evidence,
+            regulation="FINRA Rule 2210(d)(1)(B)",
+            suggested_fix=f"Remove '{match.group()}' and replace with balanced language acknowledging risks",
+        ))
+
+    # PII check — an SSN needs dashes, which most advisor communications lack,
+    # so a memchr-cheap containment test gates the regex scan.
+    if "-" in text and _SSN_RE.search(text):
+        report.violations.append(Violation.model_construct(
             violation_type=ViolationType.PII_IN_EXTERNAL,
             severity="high",
             description="Social Security Number detected in external communication",
@@ -198,9 +394,7 @@ def _rule_based_checks(
 
     # Performance without disclaimer
     if report.contains_performance_data:
-        has_disclaimer = any(phrase in text_lower for phrase in [
-            "past performance", "no guarantee", "not indicative", "may lose value",
-        ])
+        has_disclaimer = bool(_DISCLAIMER_RE.search(text))
         if not has_disclaimer:
             report.required_disclosures.append(
                 "Past performance is not indicative of future results. Investments may lose value."
@@ -213,8 +407,9 @@ def _rule_based_checks(
             "Heightened supervision required per FINRA Regulatory Notice 07-43."
         )
 
-    # Recalculate decision based on all violations
-    high_violations = sum(1 for v in report.violations if v.severity == "high")
+    # Recalculate decision based on all violations — one severity pass
+    severity_counts = Counter(v.severity for v in report.violations)
+    high_violations = severity_counts["high"]
     if high_violations >= 2:
         report.decision = ComplianceDecision.REJECTED
     elif high_violations == 1 or len(report.violations) >= 3:
@@ -226,3 +421,11 @@ def _rule_based_checks(
     report.overall_risk_score = min(1.0, len(report.violations) * 0.2 + high_violations * 0.3)
 
     return report
+
+
+# Pydantic builds its core validator/serializer lazily on first use; force the
+# build at import so the first compliance check doesn't pay for it.
+for _model in (Violation, ClientContext, ComplianceReport):
+    _model.model_rebuild()
+    _ = (_model.__pydantic_validator__, _model.__pydantic_serializer__)
+del _model
@@ -10,13 +10,58 @@ Uses:
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any
+from functools import lru_cache
+from typing import Any, Literal
 
 import structlog
 
 logger = structlog.get_logger()
 
 
+@lru_cache(maxsize=1)
+def _get_encoding():
+    import tiktoken
+
+    return tiktoken.get_encoding("cl100k_base")
+
+
+def quantize_int8(vectors):
+    """L2-normalize then scalar-quantize embeddings to int8.
+
+    Cosine similarity on the normalized vectors is preserved (≈ int8 dot
+    product / 127²) while the index shrinks 4x versus float32.
+    """
+    import numpy as np
+
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return np.clip(np.round(vectors / norms * 127.0), -127, 127).astype(np.int8)
+
+
+class _DimensionedOpenAIEmbedding:
+    """Chroma embedding function that forwards a reduced `dimensions`.
+
+    OpenAI's Matryoshka-trained text-embedding-3 models support truncated
+    output; 512 dims cuts vector RAM/bandwidth 6x on -large with negligible
+    recall loss.
+    """
+
+    def __init__(self, model_name: str, dimensions: int):
+        self.model_name = model_name
+        self.dimensions = dimensions
+        self._client = None
+
+    def __call__(self, input):  # chroma EmbeddingFunction protocol
+        from openai import OpenAI
+
+        if self._client is None:
+            self._client = OpenAI()
+        response = self._client.embeddings.create(
+            model=self.model_name, input=input, dimensions=self.dimensions
+        )
+        return [d.embedding for d in response.data]
+
+
 @dataclass
 class ChunkResult:
     """A retrieved document chunk with metadata."""
@@ -36,12 +81,26 @@ class DocumentRAG:
         embedding_model: str = "text-embedding-3-large",
         chunk_size: int = 1000,
         chunk_overlap: int = 200,
+        chunk_size_tokens: int | None = None,
+        embedding_dimensions: int | None = None,
+        retrieval_backend: Literal["chroma", "numpy"] = "chroma",
     ):
         self.collection_name = collection_name
         self.embedding_model = embedding_model
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
+        # When set, chunks are budgeted in tokens and cut at the best
+        # paragraph/sentence/word boundary instead of fixed char windows.
+        self.chunk_size_tokens = chunk_size_tokens
+        # When set, embeddings are requested truncated to this many dims.
+        self.embedding_dimensions = embedding_dimensions
+        # "numpy": in-process exact inner-product index over normalized
+        # vectors — no Chroma dependency on the query path.
+        self.retrieval_backend = retrieval_backend
         self._collection = None
+        self._np_vectors = None
+        self._np_chunks: list[dict] = []
+        self._sync_client = None
 
     def _get_collection(self):
         """Lazy-init ChromaDB collection."""
@@ -52,7 +111,10 @@ class DocumentRAG:
             from chromadb.utils.embedding_functions import OpenAIEmbeddingFunction
 
             client = chromadb.Client()
-            embedding_fn = OpenAIEmbeddingFunction(model_name=self.embedding_model)
+            if self.embedding_dimensions:
+                embedding_fn = _DimensionedOpenAIEmbedding(self.embedding_model, self.embedding_dimensions)
+            else:
+                embedding_fn = OpenAIEmbeddingFunction(model_name=self.embedding_model)
             self._collection = client.get_or_create_collection(
                 name=self.collection_name,
                 embedding_function=embedding_fn,
@@ -63,40 +125,209 @@ class DocumentRAG:
             logger.error("chromadb_init_failed", error=str(e))
             return None
 
-    def _chunk_text(self, text: str, source: str = "") -> list[dict]:
-        """Split text into overlapping chunks."""
-        chunks = []
+    def _chunk_text(self, text: str, source: str = "") -> tuple[list[str], list[str], list[dict]]:
+        """Split text into overlapping chunks as parallel id/document/metadata lists.
+
+        Chunk starts come from a single range; each list is built in one
+        comprehension with no intermediate per-chunk dicts.
+        """
+        starts = range(0, len(text), self.chunk_size - self.chunk_overlap)
+        ids = [f"{source}_{i}" for i in range(len(starts))]
+        documents = [text[s:s + self.chunk_size] for s in starts]
+        metadatas = [
+            {"source": source, "chunk_index": i, "char_start": s}
+            for i, s in enumerate(starts)
+        ]
+        return ids, documents, metadatas
+
+    def _chunk_text_tokens(self, text: str, source: str = "") -> tuple[list[str], list[str], list[dict]]:
+        """Token-budgeted chunks cut at the best boundary inside the budget.
+
+        Scans backward through the last ~10% of each window for a paragraph
+        break, then sentence end, newline, or space, so semantically adjacent
+        content stays together and fewer chunks are embedded overall.
+        """
+        enc = _get_encoding()
+        tokens = enc.encode(text)
+        total = len(tokens)
+        ids: list[str] = []
+        documents: list[str] = []
+        metadatas: list[dict] = []
         start = 0
-        chunk_id = 0
-        while start < len(text):
-            end = min(start + self.chunk_size, len(text))
-            chunk_text = text[start:end]
-            chunks.append({
-                "id": f"{source}_{chunk_id}",
-                "text": chunk_text,
-                "metadata": {"source": source, "chunk_index": chunk_id, "char_start": start},
-            })
-            start += self.chunk_size - self.chunk_overlap
-            chunk_id += 1
-        return chunks
+        index = 0
+        char_start = 0
+        while start < total:
+            end = min(start + self.chunk_size_tokens, total)
+            chunk = enc.decode(tokens[start:end])
+            if end < total:
+                tail_from = max(len(chunk) - max(1, len(chunk) // 10), 0)
+                cut = 0
+                for sep in ("\n\n", ". ", "\n", " "):
+                    found = chunk.rfind(sep, tail_from)
+                    if found > 0:
+                        cut = found + len(sep)
+                        break
+                if cut > 0:
+                    # Shrink to the largest token boundary at or before the
+                    # separator so every chunk is an exact token-range decode
+                    # and the chunks reassemble the document verbatim.
+                    lo, hi = 1, end - start
+                    while lo < hi:
+                        mid = (lo + hi + 1) // 2
+                        if len(enc.decode(tokens[start:start + mid])) <= cut:
+                            lo = mid
+                        else:
+                            hi = mid - 1
+                    end = start + lo
+                    chunk = enc.decode(tokens[start:end])
+            ids.append(f"{source}_{index}")
+            documents.append(chunk)
+            metadatas.append({"source": source, "chunk_index": index, "char_start": char_start})
+            char_start += len(chunk)
+            start = end
+            index += 1
+        return ids, documents, metadatas
+
+    def _split(self, text: str, source: str) -> tuple[list[str], list[str], list[dict]]:
+        if self.chunk_size_tokens:
+            return self._chunk_text_tokens(text, source)
+        return self._chunk_text(text, source)
+
+    def _embed_texts(self, texts: list[str]):
+        """Embed texts synchronously, honoring embedding_dimensions.
+
+        The OpenAI client is created once per instance so query-path calls
+        reuse its connection pool instead of paying a handshake each time.
+        """
+        import numpy as np
+
+        if self._sync_client is None:
+            from openai import OpenAI
+
+            self._sync_client = OpenAI()
+        kwargs: dict = {"model": self.embedding_model}
+        if self.embedding_dimensions:
+            kwargs["dimensions"] = self.embedding_dimensions
+        response = self._sync_client.embeddings.create(input=texts, **kwargs)
+        vectors = np.asarray([d.embedding for d in response.data], dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def _ingest_numpy(self, documents: list[str], metadatas: list[dict]) -> int:
+        import numpy as np
+
+        vectors = self._embed_texts(documents)
+        self._np_vectors = (
+            vectors if self._np_vectors is None else np.vstack([self._np_vectors, vectors])
+        )
+        self._np_chunks.extend(
+            {"text": d, "metadata": m} for d, m in zip(documents, metadatas, strict=True)
+        )
+        return len(documents)
+
+    def _query_numpy(self, question: str, n_results: int) -> list[ChunkResult]:
+        import numpy as np
+
+        if self._np_vectors is None:
+            return []
+        query_vec = self._embed_texts([question])[0]
+        scores = self._np_vectors @ query_vec
+        k = min(n_results, scores.size)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [
+            ChunkResult(
+                text=self._np_chunks[i]["text"],
+                source=self._np_chunks[i]["metadata"].get("source", ""),
+                page=self._np_chunks[i]["metadata"].get("page"),
+                score=float(scores[i]),
+                metadata=self._np_chunks[i]["metadata"],
+            )
+            for i in top
+        ]
 
     def ingest_document(self, text: str, source: str, metadata: dict | None = None) -> int:
         """Ingest a document into the vector store."""
+        ids, documents, metadatas = self._split(text, source)
+        if metadata:
+            metadatas = [{**metadata, **m} for m in metadatas]
+
+        if self.retrieval_backend == "numpy":
+            count = self._ingest_numpy(documents, metadatas)
+            logger.info("document_ingested", source=source, chunks=count)
+            return count
+
         collection = self._get_collection()
         if collection is None:
             return 0
 
-        chunks = self._chunk_text(text, source)
-        ids = [c["id"] for c in chunks]
-        documents = [c["text"] for c in chunks]
-        metadatas = [{**(metadata or {}), **c["metadata"]} for c in chunks]
-
         collection.add(ids=ids, documents=documents, metadatas=metadatas)
-        logger.info("document_ingested", source=source, chunks=len(chunks))
-        return len(chunks)
+        logger.info("document_ingested", source=source, chunks=len(ids))
+        return len(ids)
+
+    async def ingest_document_async(
+        self,
+        text: str,
+        source: str,
+        metadata: dict | None = None,
+        batch_size: int = 100,
+        max_concurrency: int = 8,
+        quantize_embeddings: bool = False,
+    ) -> int:
+        """Ingest with embeddings fetched in concurrent batches.
+
+        Chunks are embedded via the OpenAI embeddings endpoint in batches of
+        up to 100 inputs, issued concurrently behind a semaphore; passing the
+        precomputed vectors to collection.add skips Chroma's sequential
+        internal embedding path entirely.
+        """
+        import asyncio
+
+        import numpy as np
+
+        collection = self._get_collection()
+        if collection is None:
+            return 0
+
+        ids, documents, metadatas = self._split(text, source)
+        if not documents:
+            return 0
+        if metadata:
+            metadatas = [{**metadata, **m} for m in metadatas]
+
+        try:
+            from models._openai_client import get_async_client
+            client = get_async_client()
+        except ImportError:
+            from openai import AsyncOpenAI
+            client = AsyncOpenAI()
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        embed_kwargs: dict = {"model": self.embedding_model}
+        if self.embedding_dimensions:
+            embed_kwargs["dimensions"] = self.embedding_dimensions
+
+        async def _embed(batch: list[str]) -> list[list[float]]:
+            async with semaphore:
+                response = await client.embeddings.create(input=batch, **embed_kwargs)
+                return [d.embedding for d in response.data]
+
+        batches = [documents[i:i + batch_size] for i in range(0, len(documents), batch_size)]
+        embedded = await asyncio.gather(*(_embed(b) for b in batches))
+        embeddings = np.asarray([vec for batch in embedded for vec in batch], dtype=np.float32)
+        if quantize_embeddings:
+            embeddings = quantize_int8(embeddings)
+
+        collection.add(ids=ids, documents=documents, embeddings=embeddings, metadatas=metadatas)
+        logger.info("document_ingested", source=source, chunks=len(ids))
+        return len(ids)
 
     def query(self, question: str, n_results: int = 5) -> list[ChunkResult]:
         """Retrieve relevant chunks for a question."""
+        if self.retrieval_backend == "numpy":
+            return self._query_numpy(question, n_results)
+
         collection = self._get_collection()
         if collection is None:
             return []
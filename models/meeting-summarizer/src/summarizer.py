@@ -4,6 +4,7 @@ Meeting Summarizer Engine — structured summarization with compliance awareness
 
 from __future__ import annotations
 
+import re
 from enum import Enum
 from typing import Optional
 
@@ -12,6 +13,23 @@ import structlog
 
 logger = structlog.get_logger()
 
+# PII detection patterns, compiled once at import
+_PII_PATTERNS = {
+    "ssn": r"\b\d{3}-\d{2}-\d{4}\b",
+    "account_number": r"\b\d{8,12}\b",
+    "phone": r"\b(?:\+1[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b",
+    "email": r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b",
+    "dollar_amount": r"\$[\d,]+(?:\.\d{2})?",
+}
+# All PII patterns fused into one named-group alternation — the transcript is
+# scanned once and each match reports its type via lastgroup. The individual
+# patterns stay compiled for the overlap rescan in _detect_pii.
+_PII_SCAN_RE = re.compile(
+    "|".join(f"(?P<{name}>{pat})" for name, pat in _PII_PATTERNS.items()),
+    re.IGNORECASE,
+)
+_PII_RES = {name: re.compile(pat, re.IGNORECASE) for name, pat in _PII_PATTERNS.items()}
+
 
 class ComplianceFlag(str, Enum):
     SUITABILITY_CONCERN = "suitability_concern"
@@ -74,6 +92,69 @@ class MeetingSummary(BaseModel):
     pii_detected: list[str] = Field(default_factory=list, description="Types of PII found in transcript")
 
 
+PROMPT_VERSION = "v1"
+
+try:
+    from models._llm_cache import ExtractionCache, cache_key
+except ImportError:  # project root not on sys.path — run without a cache
+    ExtractionCache = None
+
+try:
+    from models._semantic_cache import SemanticCache, normalize_text
+except ImportError:
+    SemanticCache = None
+
+_summary_cache = None
+_semantic_cache = None
+
+
+def _get_cache():
+    global _summary_cache
+    if ExtractionCache is None:
+        return None
+    if _summary_cache is None:
+        _summary_cache = ExtractionCache(".llm_cache/meeting-summarizer")
+    return _summary_cache
+
+
+def _get_semantic_cache():
+    global _semantic_cache
+    if SemanticCache is None:
+        return None
+    if _semantic_cache is None:
+        _semantic_cache = SemanticCache("mtg_summary_semantic_cache")
+    return _semantic_cache
+
+
+try:
+    from models._openai_client import get_async_client
+except ImportError:
+    get_async_client = None
+
+
+def _get_client(api_key: str = ""):
+    """Pooled AsyncOpenAI client; falls back to per-call construction."""
+    if get_async_client is not None:
+        return get_async_client(api_key)
+    from openai import AsyncOpenAI
+
+    return AsyncOpenAI(api_key=api_key) if api_key else AsyncOpenAI()
+
+
+try:
+    from models._openai_client import strict_response_format
+except ImportError:
+    strict_response_format = None
+
+if strict_response_format is not None:
+    _SUMMARY_RESPONSE_FORMAT = strict_response_format(MeetingSummary, "MeetingSummary")
+else:
+    _SUMMARY_RESPONSE_FORMAT = {
+        "type": "json_schema",
+        "json_schema": {"name": "MeetingSummary", "schema": MeetingSummary.model_json_schema(), "strict": True},
+    }
+
+
 SUMMARIZER_SYSTEM_PROMPT = """You are a meeting summarization assistant for Morgan Stanley
 Wealth Management advisors. Given a meeting transcript, produce a comprehensive structured summary.
 
@@ -104,26 +185,47 @@ async def summarize_meeting(
     Returns:
         MeetingSummary with all structured fields.
     """
-    from openai import AsyncOpenAI
-
-    client = AsyncOpenAI(api_key=api_key) if api_key else AsyncOpenAI()
+    cache = _get_cache()
+    key = None
+    if cache is not None:
+        key = cache_key("openai", model, PROMPT_VERSION, "MeetingSummary", transcript)
+        cached = cache.get(key)
+        if cached is not None:
+            logger.info("meeting_summarization_cache_hit", transcript_length=len(transcript))
+            return MeetingSummary.model_validate_json(cached)
+
+    # Near-duplicate transcripts (re-uploads differing only in timestamps or
+    # whitespace) reuse the stored summary via embedding similarity. Cache
+    # lookups embed over blocking I/O, so they run on a worker thread.
+    import asyncio
+
+    semantic_cache = _get_semantic_cache()
+    normalized = None
+    if semantic_cache is not None:
+        normalized = normalize_text(transcript)
+        semantic_hit = await asyncio.to_thread(semantic_cache.get, normalized)
+        if semantic_hit is not None:
+            return MeetingSummary.model_validate_json(semantic_hit)
+
+    client = _get_client(api_key)
 
     logger.info("meeting_summarization_start", transcript_length=len(transcript), model=model)
 
     try:
-        response = await client.beta.chat.completions.parse(
+        response = await client.chat.completions.create(
             model=model,
             messages=[
                 {"role": "system", "content": SUMMARIZER_SYSTEM_PROMPT},
                 {"role": "user", "content": f"Meeting Transcript:\n\n{transcript}"},
             ],
-            response_format=MeetingSummary,
+            response_format=_SUMMARY_RESPONSE_FORMAT,
             temperature=0,
         )
 
-        summary = response.choices[0].message.parsed
-        if summary is None:
+        content = response.choices[0].message.content
+        if not content:
             raise ValueError("LLM returned no parsed output")
+        summary = MeetingSummary.model_validate_json(content)
 
         # Post-processing: PII detection
         summary = _detect_pii(summary, transcript)
@@ -135,6 +237,13 @@ async def summarize_meeting(
             confidence=summary.confidence_score,
         )
 
+        if cache is not None or semantic_cache is not None:
+            summary_json = summary.model_dump_json()
+            if cache is not None:
+                cache.put(key, summary_json.encode())
+            if semantic_cache is not None:
+                await asyncio.to_thread(semantic_cache.put, normalized, summary_json)
+
         return summary
 
     except Exception as e:
@@ -144,20 +253,23 @@ async def summarize_meeting(
 
 def _detect_pii(summary: MeetingSummary, transcript: str) -> MeetingSummary:
     """Detect PII types in the transcript using regex patterns."""
-    import re
-
-    pii_types = []
-    patterns = {
-        "ssn": r"\b\d{3}-\d{2}-\d{4}\b",
-        "account_number": r"\b\d{8,12}\b",
-        "phone": r"\b(?:\+1[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b",
-        "email": r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b",
-        "dollar_amount": r"\$[\d,]+(?:\.\d{2})?",
-    }
-
-    for pii_type, pattern in patterns.items():
-        if re.search(pattern, transcript, re.IGNORECASE):
-            pii_types.append(pii_type)
+    found: set[str] = set()
+    matched_any = False
+    for match in _PII_SCAN_RE.finditer(transcript):
+        matched_any = True
+        found.add(match.lastgroup)
+        if len(found) == len(_PII_PATTERNS):
+            break
+    # A span consumed by one group can hide another type's overlapping match
+    # (a bare 10-digit phone is swallowed by account_number, an SSN inside a
+    # dollar figure, ...). Only a match can cause that, so when something
+    # matched but types are still missing, verify those types individually —
+    # keeping results identical to the five independent scans.
+    if matched_any and len(found) < len(_PII_PATTERNS):
+        for name, pattern in _PII_RES.items():
+            if name not in found and pattern.search(transcript):
+                found.add(name)
+    pii_types = [name for name in _PII_PATTERNS if name in found]
 
     summary.pii_detected = pii_types
 
@@ -170,3 +282,113 @@ def _detect_pii(summary: MeetingSummary, transcript: str) -> MeetingSummary:
         ))
 
     return summary
+
+
+async def summarize_meetings_batch(
+    transcripts: list[str],
+    model: str = "gpt-5.2",
+    api_key: str = "",
+    max_concurrency: int = 20,
+    max_retries: int = 5,
+) -> list[MeetingSummary]:
+    """
+    Summarize many transcripts concurrently with bounded parallelism.
+
+    Submissions overlap network and inference latency behind a semaphore;
+    rate-limit errors retry with jittered exponential backoff. Results come
+    back in input order.
+    """
+    import asyncio
+    import random
+
+    from openai import RateLimitError
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _one(transcript: str) -> MeetingSummary:
+        async with semaphore:
+            for attempt in range(max_retries):
+                try:
+                    return await summarize_meeting(transcript, model=model, api_key=api_key)
+                except RateLimitError:
+                    delay = min(30.0, 2 ** attempt + random.random())
+                    logger.info(
+                        "meeting_summarization_rate_limited",
+                        attempt=attempt + 1,
+                        retry_in=round(delay, 1),
+                    )
+                    await asyncio.sleep(delay)
+            # Final attempt propagates any error to the caller
+            return await summarize_meeting(transcript, model=model, api_key=api_key)
+
+    return list(await asyncio.gather(*(_one(t) for t in transcripts)))
+
+
+async def summarize_meetings_offline(
+    transcripts: list[str],
+    model: str = "gpt-5.2",
+    api_key: str = "",
+    poll_interval: float = 30.0,
+) -> list[MeetingSummary]:
+    """
+    Summarize transcripts through the OpenAI Batch API (24h window, 50% discount).
+
+    Intended for non-interactive bulk loads: uploads one JSONL of requests,
+    polls until the batch settles, and returns summaries in input order.
+    """
+    import asyncio
+    import json
+
+    client = _get_client(api_key)
+
+    lines = []
+    for i, transcript in enumerate(transcripts):
+        lines.append(json.dumps({
+            "custom_id": str(i),
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": model,
+                "messages": [
+                    {"role": "system", "content": SUMMARIZER_SYSTEM_PROMPT},
+                    {"role": "user", "content": f"Meeting Transcript:\n\n{transcript}"},
+                ],
+                "response_format": _SUMMARY_RESPONSE_FORMAT,
+                "temperature": 0,
+            },
+        }))
+
+    upload = await client.files.create(
+        file=("meeting_summaries.jsonl", "\n".join(lines).encode()), purpose="batch"
+    )
+    batch = await client.batches.create(
+        input_file_id=upload.id, endpoint="/v1/chat/completions", completion_window="24h"
+    )
+    logger.info("meeting_summarization_batch_submitted", batch_id=batch.id, transcripts=len(lines))
+
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        await asyncio.sleep(poll_interval)
+        batch = await client.batches.retrieve(batch.id)
+    if batch.status != "completed":
+        raise RuntimeError(f"Batch {batch.id} ended with status {batch.status}")
+
+    output = await client.files.content(batch.output_file_id)
+    results: dict[str, MeetingSummary] = {}
+    for line in output.content.splitlines():
+        record = json.loads(line)
+        custom_id = record.get("custom_id")
+        if record.get("error") or not record.get("response"):
+            raise RuntimeError(
+                f"Batch {batch.id} request {custom_id} failed: {record.get('error')}"
+            )
+        content = record["response"]["body"]["choices"][0]["message"]["content"]
+        results[custom_id] = _detect_pii(
+            MeetingSummary.model_validate_json(content), transcripts[int(custom_id)]
+        )
+    missing = [str(i) for i in range(len(transcripts)) if str(i) not in results]
+    if missing:
+        raise RuntimeError(
+            f"Batch {batch.id} returned no result for {len(missing)} request(s) "
+            f"(first missing custom_id {missing[0]}); see error file {batch.error_file_id}"
+        )
+    return [results[str(i)] for i in range(len(transcripts))]
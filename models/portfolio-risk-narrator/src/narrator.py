@@ -4,11 +4,16 @@ Portfolio Risk Narrator — data-to-text generation for risk commentary.
 
 from __future__ import annotations
 
+import re
+
 from pydantic import BaseModel, Field
 import structlog
 
 logger = structlog.get_logger()
 
+# Number extraction for the fact-checking pass, compiled once at import
+_NUM_RE = re.compile(r"\d+\.\d+|\d+")
+
 
 class PortfolioData(BaseModel):
     """Input: structured portfolio analytics data."""
@@ -60,6 +65,89 @@ class RiskNarrative(BaseModel):
     confidence_score: float = Field(0.0)
 
 
+PROMPT_VERSION = "v1"
+
+try:
+    from models._llm_cache import ExtractionCache, cache_key
+except ImportError:  # project root not on sys.path — run without a cache
+    ExtractionCache = None
+
+try:
+    from models._semantic_cache import SemanticCache, normalize_numbers
+except ImportError:
+    SemanticCache = None
+
+_narrative_cache = None
+_semantic_cache = None
+
+
+def _get_cache():
+    global _narrative_cache
+    if ExtractionCache is None:
+        return None
+    if _narrative_cache is None:
+        _narrative_cache = ExtractionCache(".llm_cache/portfolio-risk-narrator")
+    return _narrative_cache
+
+
+def _get_semantic_cache():
+    global _semantic_cache
+    if SemanticCache is None:
+        return None
+    if _semantic_cache is None:
+        _semantic_cache = SemanticCache("risk_narrative_semantic_cache")
+    return _semantic_cache
+
+
+try:
+    from models._openai_client import get_async_client
+except ImportError:
+    get_async_client = None
+
+
+def _get_client(api_key: str = ""):
+    """Pooled AsyncOpenAI client; falls back to per-call construction."""
+    if get_async_client is not None:
+        return get_async_client(api_key)
+    from openai import AsyncOpenAI
+
+    return AsyncOpenAI(api_key=api_key) if api_key else AsyncOpenAI()
+
+
+try:
+    from models._openai_client import strict_response_format
+except ImportError:
+    strict_response_format = None
+
+if strict_response_format is not None:
+    _NARRATIVE_RESPONSE_FORMAT = strict_response_format(RiskNarrative, "RiskNarrative")
+else:
+    _NARRATIVE_RESPONSE_FORMAT = {
+        "type": "json_schema",
+        "json_schema": {"name": "RiskNarrative", "schema": RiskNarrative.model_json_schema(), "strict": True},
+    }
+
+
+# Serialized-portfolio cache keyed on (portfolio_id, as_of_date); retries and
+# semantic-cache misses on an unchanged portfolio skip reserialization. The
+# stored instance is compared for equality so a changed portfolio with the
+# same key never serves stale JSON.
+_portfolio_json_cache: dict[tuple[str, str], tuple[PortfolioData, str]] = {}
+
+
+def _portfolio_json(portfolio: PortfolioData) -> str:
+    key = (portfolio.portfolio_id, portfolio.as_of_date)
+    cached = _portfolio_json_cache.get(key)
+    if cached is not None and cached[0] == portfolio:
+        return cached[1]
+    # No indent: pretty-printing only adds prompt tokens the model ignores.
+    dumped = portfolio.model_dump_json()
+    if len(_portfolio_json_cache) >= 1024:
+        _portfolio_json_cache.clear()
+    _portfolio_json_cache[key] = (portfolio, dumped)
+    return dumped
+
+
 NARRATOR_SYSTEM_PROMPT = """You are a portfolio risk analyst at Morgan Stanley Wealth Management.
 Given structured portfolio data, generate professional risk commentary suitable for client
 quarterly reports and risk committee presentations.
@@ -81,33 +169,62 @@ async def generate_risk_narrative(
     api_key: str = "",
 ) -> RiskNarrative:
     """Generate risk commentary from portfolio data."""
-    from openai import AsyncOpenAI
-
-    client = AsyncOpenAI(api_key=api_key) if api_key else AsyncOpenAI()
+    portfolio_json = _portfolio_json(portfolio)
+
+    cache = _get_cache()
+    key = None
+    if cache is not None:
+        key = cache_key("openai", model, PROMPT_VERSION, "RiskNarrative", portfolio_json)
+        cached = cache.get(key)
+        if cached is not None:
+            logger.info("risk_narrative_cache_hit", portfolio_id=portfolio.portfolio_id)
+            return RiskNarrative.model_validate_json(cached)
+
+    # Portfolios that differ only in float rounding map to the same narrative
+    # via the embedding-similarity cache. Cache lookups embed over blocking
+    # I/O, so they run on a worker thread.
+    import asyncio
+
+    semantic_cache = _get_semantic_cache()
+    normalized = None
+    if semantic_cache is not None:
+        normalized = normalize_numbers(portfolio.model_dump())
+        semantic_hit = await asyncio.to_thread(semantic_cache.get, normalized)
+        if semantic_hit is not None:
+            return RiskNarrative.model_validate_json(semantic_hit)
+
+    client = _get_client(api_key)
 
     logger.info("risk_narrative_start", portfolio_id=portfolio.portfolio_id, model=model)
 
-    portfolio_json = portfolio.model_dump_json(indent=2)
-
     try:
-        response = await client.beta.chat.completions.parse(
+        response = await client.chat.completions.create(
             model=model,
             messages=[
                 {"role": "system", "content": NARRATOR_SYSTEM_PROMPT},
                 {"role": "user", "content": f"Generate risk commentary for this portfolio:\n\n{portfolio_json}"},
             ],
-            response_format=RiskNarrative,
+            response_format=_NARRATIVE_RESPONSE_FORMAT,
             temperature=0.2,
         )
 
-        narrative = response.choices[0].message.parsed
-        if narrative is None:
+        content = response.choices[0].message.content
+        if not content:
             raise ValueError("LLM returned no parsed output")
+        narrative = RiskNarrative.model_validate_json(content)
 
         # Fact-check: verify all cited numbers exist in source data
         narrative = _fact_check_narrative(narrative, portfolio)
 
         logger.info("risk_narrative_complete", confidence=narrative.confidence_score)
+
+        if cache is not None or semantic_cache is not None:
+            narrative_json = narrative.model_dump_json()
+            if cache is not None:
+                cache.put(key, narrative_json.encode())
+            if semantic_cache is not None:
+                await asyncio.to_thread(semantic_cache.put, normalized, narrative_json)
+
         return narrative
 
     except Exception as e:
@@ -117,8 +234,6 @@ async def generate_risk_narrative(
 
 def _fact_check_narrative(narrative: RiskNarrative, portfolio: PortfolioData) -> RiskNarrative:
     """Verify all numbers in the narrative exist in the source data."""
-    import re
-
     source_numbers = {
         "total_value": portfolio.total_value,
         "mtd_return_pct": portfolio.mtd_return_pct,
@@ -134,6 +249,18 @@ def _fact_check_narrative(narrative: RiskNarrative, portfolio: PortfolioData) ->
         "top_holding_pct": portfolio.top_holding_pct,
     }
 
+    # Hashed tolerance index: each source value registers under its rounded
+    # key and both neighbors, so every extracted number verifies with one
+    # dict lookup instead of a scan over all source fields. setdefault keeps
+    # the earlier field winning ties, matching the old first-match order.
+    index: dict[float, str] = {}
+    for field_name, source_val in source_numbers.items():
+        if source_val is None:
+            continue
+        base = round(abs(source_val), 2)
+        for neighbor in (base - 0.01, base, base + 0.01):
+            index.setdefault(round(neighbor, 2), field_name)
+
     cited = []
     full_text = " ".join([
         narrative.executive_summary,
@@ -141,20 +268,13 @@ def _fact_check_narrative(narrative: RiskNarrative, portfolio: PortfolioData) ->
         narrative.risk_assessment,
     ])
 
-    numbers_in_text = re.findall(r'[\d]+\.[\d]+|[\d]+', full_text)
-    for num_str in numbers_in_text:
-        try:
-            num = float(num_str)
-            matched = False
-            for field_name, source_val in source_numbers.items():
-                if source_val is not None and abs(num - abs(source_val)) < 0.01:
-                    cited.append({"value": num, "source_field": field_name, "verified": True})
-                    matched = True
-                    break
-            if not matched and num > 1:  # Ignore small numbers like percentages
-                cited.append({"value": num, "source_field": "UNVERIFIED", "verified": False})
-        except ValueError:
-            pass
+    for match in _NUM_RE.finditer(full_text):
+        num = float(match.group())
+        field_name = index.get(round(num, 2))
+        if field_name is not None:
+            cited.append({"value": num, "source_field": field_name, "verified": True})
+        elif num > 1:  # Ignore small numbers like percentages
+            cited.append({"value": num, "source_field": "UNVERIFIED", "verified": False})
 
     narrative.numbers_cited = cited
     verified_count = sum(1 for c in cited if c["verified"])
@@ -162,3 +282,131 @@ def _fact_check_narrative(narrative: RiskNarrative, portfolio: PortfolioData) ->
     narrative.confidence_score = verified_count / total_count
 
     return narrative
+
+
+def portfolio_from_json(raw: bytes | str) -> PortfolioData:
+    """Decode inbound portfolio JSON on pydantic-core's C path.
+
+    Bulk callers should prefer this over json.loads + PortfolioData(**data) —
+    validation happens in one Rust pass over the bytes.
+    """
+    return PortfolioData.model_validate_json(raw)
+
+
+# Build the core validators/serializers at import so the first narrative call
+# doesn't pay for them.
+for _model in (PortfolioData, RiskNarrative):
+    _model.model_rebuild()
+    _ = (_model.__pydantic_validator__, _model.__pydantic_serializer__)
+del _model
+
+
+async def generate_risk_narratives_batch(
+    portfolios: list[PortfolioData],
+    model: str = "gpt-5.2",
+    api_key: str = "",
+    max_concurrency: int = 20,
+    max_retries: int = 5,
+) -> list[RiskNarrative]:
+    """
+    Generate narratives for many portfolios concurrently.
+
+    Submissions overlap network and inference latency behind a semaphore;
+    rate-limit errors retry with jittered exponential backoff. Results come
+    back in input order.
+    """
+    import asyncio
+    import random
+
+    from openai import RateLimitError
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _one(portfolio: PortfolioData) -> RiskNarrative:
+        async with semaphore:
+            for attempt in range(max_retries):
+                try:
+                    return await generate_risk_narrative(portfolio, model=model, api_key=api_key)
+                except RateLimitError:
+                    delay = min(30.0, 2 ** attempt + random.random())
+                    logger.info(
+                        "risk_narrative_rate_limited",
+                        attempt=attempt + 1,
+                        retry_in=round(delay, 1),
+                    )
+                    await asyncio.sleep(delay)
+            # Final attempt propagates any error to the caller
+            return await generate_risk_narrative(portfolio, model=model, api_key=api_key)
+
+    return list(await asyncio.gather(*(_one(p) for p in portfolios)))
+
+
+async def generate_risk_narratives_offline(
+    portfolios: list[PortfolioData],
+    model: str = "gpt-5.2",
+    api_key: str = "",
+    poll_interval: float = 30.0,
+) -> list[RiskNarrative]:
+    """
+    Generate narratives through the OpenAI Batch API (24h window, 50% discount).
+
+    For bulk report generation where latency is irrelevant: uploads one
+    JSONL of requests, polls until the batch settles, and returns
+    fact-checked narratives in input order.
+    """
+    import asyncio
+    import json
+
+    client = _get_client(api_key)
+
+    lines = []
+    for i, portfolio in enumerate(portfolios):
+        lines.append(json.dumps({
+            "custom_id": str(i),
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": model,
+                "messages": [
+                    {"role": "system", "content": NARRATOR_SYSTEM_PROMPT},
+                    {"role": "user", "content": f"Generate risk commentary for this portfolio:\n\n{_portfolio_json(portfolio)}"},
+                ],
+                "response_format": _NARRATIVE_RESPONSE_FORMAT,
+                "temperature": 0.2,
+            },
+        }))
+
+    upload = await client.files.create(
+        file=("risk_narratives.jsonl", "\n".join(lines).encode()), purpose="batch"
+    )
+    batch = await client.batches.create(
+        input_file_id=upload.id, endpoint="/v1/chat/completions", completion_window="24h"
+    )
+    logger.info("risk_narrative_batch_submitted", batch_id=batch.id, portfolios=len(lines))
+
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        await asyncio.sleep(poll_interval)
+        batch = await client.batches.retrieve(batch.id)
+    if batch.status != "completed":
+        raise RuntimeError(f"Batch {batch.id} ended with status {batch.status}")
+
+    output = await client.files.content(batch.output_file_id)
+    results: dict[str, RiskNarrative] = {}
+    for line in output.content.splitlines():
+        record = json.loads(line)
+        custom_id = record.get("custom_id")
+        if record.get("error") or not record.get("response"):
+            raise RuntimeError(
+                f"Batch {batch.id} request {custom_id} failed: {record.get('error')}"
+            )
+        content = record["response"]["body"]["choices"][0]["message"]["content"]
+        results[custom_id] = _fact_check_narrative(
+            RiskNarrative.model_validate_json(content), portfolios[int(custom_id)]
+        )
+    missing = [str(i) for i in range(len(portfolios)) if str(i) not in results]
+    if missing:
+        raise RuntimeError(
+            f"Batch {batch.id} returned no result for {len(missing)} request(s) "
+            f"(first missing custom_id {missing[0]}); see error file {batch.error_file_id}"
+        )
+    return [results[str(i)] for i in range(len(portfolios))]